@@ -156,12 +156,22 @@ function loadEfficiencyData() {
     } catch (e) { console.error('Error loading corrections:', e.message); }
   }
 
-  // Load outcomes
+  // Load outcomes (append-only outcomes.jsonl, or the legacy outcomes.json)
+  const outcomesLogPath = path.join(LEARNING_DIR, 'outcomes.jsonl');
   const outcomesPath = path.join(LEARNING_DIR, 'outcomes.json');
-  if (fs.existsSync(outcomesPath)) {
+  if (fs.existsSync(outcomesLogPath) || fs.existsSync(outcomesPath)) {
     try {
-      const outcomes = JSON.parse(fs.readFileSync(outcomesPath, 'utf8'));
-      const list = outcomes.outcomes || [];
+      let list;
+      if (fs.existsSync(outcomesLogPath)) {
+        list = [];
+        fs.readFileSync(outcomesLogPath, 'utf8').split('\n').forEach(line => {
+          if (!line.trim()) return;
+          try { list.push(JSON.parse(line)); } catch (e) { /* torn line */ }
+        });
+      } else {
+        const outcomes = JSON.parse(fs.readFileSync(outcomesPath, 'utf8'));
+        list = outcomes.outcomes || [];
+      }
 
       list.forEach(o => {
         if (o.outcome === 'success') data.outcomes.success++;
@@ -182,12 +192,19 @@ function loadEfficiencyData() {
     } catch (e) { console.error('Error loading outcomes:', e.message); }
   }
 
-  // Load confidence calibration
-  const calibrationPath = path.join(LEARNING_DIR, 'confidence_calibration.json');
+  // Load confidence calibration (calibration_stats.json, or the legacy
+  // confidence_calibration.json until the Python side has migrated it)
+  const calibrationStatsPath = path.join(LEARNING_DIR, 'calibration_stats.json');
+  const legacyCalibrationPath = path.join(LEARNING_DIR, 'confidence_calibration.json');
+  const calibrationPath = fs.existsSync(calibrationStatsPath) ? calibrationStatsPath : legacyCalibrationPath;
   if (fs.existsSync(calibrationPath)) {
     try {
       const calibration = JSON.parse(fs.readFileSync(calibrationPath, 'utf8'));
-      data.confidence.domains = calibration.domains || {};
+      Object.entries(calibration.domain_stats || {}).forEach(([domain, stats]) => {
+        if (stats.total > 0) {
+          data.confidence.domains[domain] = { total: stats.total, accuracy: stats.correct / stats.total };
+        }
+      });
 
       // Find weak areas (accuracy < 0.65)
       Object.entries(data.confidence.domains).forEach(([domain, stats]) => {
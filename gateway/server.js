@@ -1589,9 +1589,15 @@ async function handleLearningStatus(params, cwd) {
     // ReasoningBank status
     if (component === 'all' || component === 'reasoning') {
       const reasoningPath = path.join(MEMORY_ROOT, 'learning', 'reasoning_bank.json');
-      if (fs.existsSync(reasoningPath)) {
-        const data = JSON.parse(fs.readFileSync(reasoningPath, 'utf8'));
-        const trajectories = data.trajectories?.length || 0;
+      // Trajectories recorded since the last save sit in an append-only log
+      const trajectoryLogPath = path.join(MEMORY_ROOT, 'learning', 'trajectories.jsonl');
+      if (fs.existsSync(reasoningPath) || fs.existsSync(trajectoryLogPath)) {
+        const data = fs.existsSync(reasoningPath) ? JSON.parse(fs.readFileSync(reasoningPath, 'utf8')) : {};
+        let trajectories = data.trajectories?.length || 0;
+        if (fs.existsSync(trajectoryLogPath)) {
+          const logged = fs.readFileSync(trajectoryLogPath, 'utf8').split('\n').filter(line => line.trim()).length;
+          trajectories = Math.min(trajectories + logged, 500);
+        }
         const patterns = data.patterns?.length || 0;
         results.push(`=== ReasoningBank ===\nTrajectories: ${trajectories}\nDistilled Patterns: ${patterns}`);
       } else {
@@ -8,6 +8,7 @@ Created to fix function name mismatches that were causing silent failures.
 """
 
 import sys
+import time
 from pathlib import Path
 
 MEMORY_ROOT = Path.home() / ".claude-dash"
@@ -29,65 +30,123 @@ def get_session_context(project_id: str) -> str:
         return ""
 
 
+# (probe function in session_health, status key, issue message)
+_HEALTH_PROBES = [
+    ("check_gateway", "running", "Gateway not running"),
+    ("check_watcher", "running", "Watcher not running"),
+    ("check_ollama", "available", "Ollama not available"),
+    ("check_database", "accessible", "Database not accessible"),
+]
+
+# Health status changes on the order of seconds; reuse recent results.
+# Each prompt runs the hook in a new process, so the cache lives on disk.
+HEALTH_CACHE_TTL = 5.0
+HEALTH_CACHE_FILE = MEMORY_ROOT / "health_cache.json"
+
+# Commits inspected for the git changes summary (only the first 3 are shown)
+SUMMARY_MAX_COMMITS = 20
+
+
+def _probe_healthy(result, key: str) -> bool:
+    """Normalize a probe result: status dict, bool, or list of issues."""
+    if isinstance(result, dict):
+        return bool(result.get(key))
+    if isinstance(result, list):
+        return not result
+    return bool(result)
+
+
+def _read_health_cache():
+    """Cached status string if written within HEALTH_CACHE_TTL, else None."""
+    try:
+        from _jsonio import json_loads
+        cached = json_loads(HEALTH_CACHE_FILE.read_bytes())
+        if 0 <= time.time() - cached["t"] < HEALTH_CACHE_TTL:
+            return cached["v"]
+    except Exception:
+        pass
+    return None
+
+
+def _write_health_cache(status: str):
+    """Persist a status string for other hook processes (best effort)."""
+    try:
+        from _jsonio import json_dumps, write_atomic
+        write_atomic(HEALTH_CACHE_FILE, json_dumps({"t": time.time(), "v": status}))
+    except Exception:
+        pass
+
+
 def check_health() -> str:
     """
     Adapter: inject_all_context.py expects check_health()
     Actual: session_health.py has check_gateway(), check_watcher(), etc.
+
+    Probes run concurrently so latency is the slowest probe, not the sum.
+    Results are cached in HEALTH_CACHE_FILE for HEALTH_CACHE_TTL seconds.
     """
+    cached = _read_health_cache()
+    if cached is not None:
+        return cached
+
     try:
-        from session_health import check_gateway, check_watcher, check_ollama, check_database
+        from concurrent.futures import ThreadPoolExecutor
+        import session_health
 
         issues = []
-
-        gateway = check_gateway()
-        if not gateway.get('running'):
-            issues.append("Gateway not running")
-
-        watcher = check_watcher()
-        if not watcher.get('running'):
-            issues.append("Watcher not running")
-
-        ollama = check_ollama()
-        if not ollama.get('available'):
-            issues.append("Ollama not available")
-
-        db = check_database()
-        if not db.get('accessible'):
-            issues.append("Database not accessible")
-
-        if issues:
-            return "System issues: " + ", ".join(issues)
-        return ""
+        with ThreadPoolExecutor(max_workers=len(_HEALTH_PROBES)) as executor:
+            futures = [
+                (executor.submit(getattr(session_health, fn_name)), key, message)
+                for fn_name, key, message in _HEALTH_PROBES
+            ]
+            for future, key, message in futures:
+                try:
+                    healthy = _probe_healthy(future.result(timeout=2), key)
+                except Exception:
+                    healthy = False
+                if not healthy:
+                    issues.append(message)
+
+        status = "System issues: " + ", ".join(issues) if issues else ""
     except Exception:
         return ""
 
+    _write_health_cache(status)
+    return status
+
 
 def get_changes_summary(project_path: str, project_id: str) -> str:
     """
     Adapter: inject_all_context.py expects get_changes_summary()
-    Actual: git_awareness.py has get_commits_since(), get_files_changed_since()
+    Actual: git_awareness.py has get_changes_since() (commits + files in one git log)
     """
     try:
-        from git_awareness import get_commits_since, get_files_changed_since, get_last_session_time
+        from git_awareness import get_changes_since, get_last_session_time, ensure_commit_graph
+
+        # Speeds up this and later git log calls on the repo
+        ensure_commit_graph(project_path)
 
         last_time = get_last_session_time(project_id)
         if not last_time:
             return ""
 
-        commits = get_commits_since(project_path, last_time)
-        files = get_files_changed_since(project_path, last_time)
+        # Only a handful are displayed; let git stop walking history early
+        commits, files = get_changes_since(project_path, last_time, max_count=SUMMARY_MAX_COMMITS)
 
         if not commits and not files:
             return ""
 
+        # A capped log only covers the newest commits, so both counts are lower bounds
+        more = "+" if len(commits) >= SUMMARY_MAX_COMMITS else ""
+
         parts = []
         if commits:
-            parts.append(f"Commits since last session: {len(commits)}")
+            parts.append(f"Commits since last session: {len(commits)}{more}")
             for c in commits[:3]:  # Show first 3
                 parts.append(f"  - {c.get('message', 'No message')[:50]}")
 
         if files:
-            parts.append(f"Files changed: {len(files)}")
+            parts.append(f"Files changed: {len(files)}{more}")
             for f in files[:5]:  # Show first 5
                 parts.append(f"  - {f}")
 
@@ -162,13 +221,14 @@ def get_semantic_context(prompt: str, project_id: str) -> str:
     Adapter: inject_all_context.py expects get_semantic_context()
     Enhanced: Uses FTS5 search (fast) + keyword matching for relevant context.
     """
+    # Short replies ("y", "continue") and slash commands carry no topic
+    if len(prompt) < 20 or prompt.lstrip().startswith('/'):
+        return ""
+
     parts = []
 
     # 1. Fast FTS5 search for relevant files
     try:
-        sys.path.insert(0, str(MEMORY_ROOT / "mlx-tools"))
-        from hybrid_search import fts5_search
-
         # Extract key terms from prompt (simple extraction)
         import re
         words = re.findall(r'\b\w{4,}\b', prompt.lower())
@@ -177,6 +237,9 @@ def get_semantic_context(prompt: str, project_id: str) -> str:
         keywords = [w for w in words if w not in stopwords][:5]
 
         if keywords and project_id:
+            sys.path.insert(0, str(MEMORY_ROOT / "mlx-tools"))
+            from hybrid_search import fts5_search
+
             query = ' OR '.join(keywords)
             results = fts5_search(project_id, query, top_k=3)
             if results:
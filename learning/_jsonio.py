@@ -0,0 +1,77 @@
+"""
+Shared JSON persistence helpers for the learning and memory modules.
+
+One copy of the orjson fallback, atomic write, append-log and file
+signature helpers, so every store gets the same durability guarantees.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List
+
+# Optional: orjson is a faster drop-in for (de)serialization
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def json_dumps(data, indent: bool = False) -> bytes:
+    """JSON bytes, compact or 2-space indented (orjson when available)."""
+    if HAS_ORJSON:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(data, indent=2).encode("utf-8")
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def json_loads(raw):
+    """Parse JSON bytes or str (orjson when available)."""
+    if HAS_ORJSON:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def write_atomic(path: Path, payload: bytes):
+    """Write bytes to a sibling .tmp file, fsync it and swap it into place."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = path.with_suffix('.tmp')
+    with open(tmp_file, 'wb') as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, path)
+
+
+def read_log(path: Path) -> List[Dict]:
+    """Parse records from a JSONL log, skipping blank or torn lines."""
+    records = []
+    try:
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    records.append(json_loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+    return records
+
+
+def fold_log(records: List[Dict], logged: List[Dict]) -> List[Dict]:
+    """Append logged records, skipping ids already folded in by an interrupted save."""
+    seen = {r.get("id") for r in records if r.get("id")}
+    return records + [r for r in logged if not r.get("id") or r["id"] not in seen]
+
+
+def file_signature(path: Path):
+    """(mtime_ns, size) of a file, or None if missing; changes whenever it is written."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
@@ -0,0 +1,49 @@
+"""
+Shared term extraction and Jaccard scoring for reasoning_bank and reasoning_chains.
+
+Kept in one module so both share a single extract_key_terms cache when a
+process (e.g. the context-injection hook) uses both.
+"""
+
+import functools
+import re
+from collections import defaultdict
+from typing import Dict, List
+
+STOPWORDS = frozenset({
+    'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been',
+    'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
+    'would', 'could', 'should', 'may', 'might', 'must', 'shall',
+    'can', 'need', 'to', 'of', 'in', 'for', 'on', 'with', 'at',
+    'by', 'from', 'as', 'into', 'that', 'this', 'it', 'its',
+    'and', 'but', 'or', 'not', 'no', 'yes', 'i', 'you', 'we',
+})
+_WORD_RE = re.compile(r'\b[a-zA-Z]{3,}\b')
+
+
+@functools.lru_cache(maxsize=8192)
+def extract_key_terms(text: str) -> frozenset:
+    """Extract key terms from text for matching (cached; returns a frozenset)."""
+    return frozenset(_WORD_RE.findall(text.lower())) - STOPWORDS
+
+
+def jaccard(terms1: frozenset, terms2: frozenset) -> float:
+    """Jaccard similarity of two term sets (0.0 if either is empty)."""
+    if not terms1 or not terms2:
+        return 0.0
+    intersection = len(terms1 & terms2)
+    return intersection / (len(terms1) + len(terms2) - intersection)
+
+
+def compute_similarity(text1: str, text2: str) -> float:
+    """Compute Jaccard similarity between two texts."""
+    return jaccard(extract_key_terms(text1), extract_key_terms(text2))
+
+
+def build_term_index(term_sets: List[frozenset]) -> Dict[str, List[int]]:
+    """Inverted index term -> positions of the term sets containing it."""
+    index = defaultdict(list)
+    for i, terms in enumerate(term_sets):
+        for term in terms:
+            index[term].append(i)
+    return index
@@ -67,23 +67,26 @@ def cleanup_observations(path, limit):
 def cleanup_reasoning_bank():
     """Deduplicate reasoning bank trajectories."""
     rb_path = MEMORY_ROOT / "learning" / "reasoning_bank.json"
-    if not rb_path.exists():
+    rb_log = MEMORY_ROOT / "learning" / "trajectories.jsonl"
+    if not rb_path.exists() and not rb_log.exists():
         return
     
-    data = json.loads(rb_path.read_text())
-    trajectories = data.get("trajectories", [])
-    original_count = len(trajectories)
-    
-    # Deduplicate by problem text (first 100 chars)
-    seen = {}
-    for traj in trajectories:
-        key = traj.get("problem", "")[:100]
-        if key not in seen:
-            seen[key] = traj
-    
-    deduped = list(seen.values())
-    data["trajectories"] = deduped[-500:]  # Keep last 500
-    rb_path.write_text(json.dumps(data, indent=2))
+    from reasoning_bank import load_reasoning_bank, save_reasoning_bank, reasoning_bank_lock
+    with reasoning_bank_lock():
+        data = load_reasoning_bank()  # includes trajectories still in the append log
+        trajectories = data.get("trajectories", [])
+        original_count = len(trajectories)
+
+        # Deduplicate by problem text (first 100 chars)
+        seen = {}
+        for traj in trajectories:
+            key = traj.get("problem", "")[:100]
+            if key not in seen:
+                seen[key] = traj
+
+        deduped = list(seen.values())
+        data["trajectories"] = deduped[-500:]  # Keep last 500
+        save_reasoning_bank(data)
     
     print(f"Reasoning bank: {original_count} -> {len(deduped)} trajectories")
 
@@ -22,8 +22,16 @@ from pathlib import Path
 from datetime import datetime, timezone
 from collections import defaultdict
 
+from _jsonio import json_dumps, write_atomic
+
 MEMORY_ROOT = Path.home() / ".claude-dash"
-CALIBRATION_FILE = MEMORY_ROOT / "learning" / "confidence_calibration.json"
+CALIBRATION_FILE = MEMORY_ROOT / "learning" / "confidence_calibration.json"  # legacy combined file
+STATS_FILE = MEMORY_ROOT / "learning" / "calibration_stats.json"
+PREDICTIONS_FILE = MEMORY_ROOT / "learning" / "calibration_predictions.jsonl"
+
+MAX_PREDICTIONS = 500
+# Compact the predictions log once it grows well past MAX_PREDICTIONS entries
+PREDICTIONS_COMPACT_BYTES = 512 * 1024
 
 # Domain categories
 DOMAINS = [
@@ -38,33 +46,100 @@ DOMAINS = [
 ]
 
 
+def _empty_stats():
+    return {
+        "domain_stats": {},
+        "topic_stats": {},
+        "overall": {"correct": 0, "incorrect": 0, "partial": 0}
+    }
+
+
+def _write_predictions(records):
+    write_atomic(PREDICTIONS_FILE, b"".join(json_dumps(r) + b"\n" for r in records))
+
+
+def _migrate_legacy_file():
+    """Split the legacy combined file into the stats file + predictions log."""
+    try:
+        legacy = json.loads(CALIBRATION_FILE.read_text())
+    except:
+        return None
+
+    stats = _empty_stats()
+    for key in stats:
+        if key in legacy:
+            stats[key] = legacy[key]
+
+    _write_predictions(legacy.get("predictions", [])[-MAX_PREDICTIONS:])
+
+    save_calibration(stats)
+    return stats
+
+
 def load_calibration():
-    """Load calibration data."""
-    if not CALIBRATION_FILE.exists():
-        return {
-            "predictions": [],
-            "domain_stats": {},
-            "topic_stats": {},
-            "overall": {"correct": 0, "incorrect": 0, "partial": 0}
-        }
+    """Load calibration stats (domain_stats, topic_stats, overall).
+
+    Predictions live in a separate append-only log so the hot read path
+    only parses the small stats file. See load_predictions().
+    """
+    if not STATS_FILE.exists():
+        if CALIBRATION_FILE.exists():
+            migrated = _migrate_legacy_file()
+            if migrated is not None:
+                return migrated
+        return _empty_stats()
 
     try:
-        return json.loads(CALIBRATION_FILE.read_text())
+        return json.loads(STATS_FILE.read_text())
     except:
-        return {"predictions": [], "domain_stats": {}, "topic_stats": {}, "overall": {}}
+        return {"domain_stats": {}, "topic_stats": {}, "overall": {}}
 
 
 def save_calibration(data):
-    """Save calibration data."""
-    CALIBRATION_FILE.parent.mkdir(parents=True, exist_ok=True)
-    CALIBRATION_FILE.write_text(json.dumps(data, indent=2))
+    """Save calibration stats."""
+    write_atomic(STATS_FILE, json_dumps(data, indent=True))
 
 
-def detect_domain(text):
-    """Detect domain from text content."""
-    text_lower = text.lower()
+def load_predictions(limit=MAX_PREDICTIONS):
+    """Load the most recent prediction records from the log."""
+    if not PREDICTIONS_FILE.exists():
+        return []
+
+    predictions = []
+    try:
+        with open(PREDICTIONS_FILE) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    predictions.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    except OSError:
+        return []
+
+    return predictions[-limit:]
+
+
+def _append_prediction(record):
+    """Append a prediction record, compacting the log when it grows too large."""
+    PREDICTIONS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(PREDICTIONS_FILE, "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+    try:
+        if PREDICTIONS_FILE.stat().st_size > PREDICTIONS_COMPACT_BYTES:
+            _write_predictions(load_predictions())
+    except OSError:
+        pass
 
-    domain_keywords = {
+
+# Keywords used by detect_domain(), checked in order; names and keywords are
+# interned tuples so the table is built once at import
+DOMAIN_KEYWORDS = {
+    sys.intern(domain): tuple(sys.intern(k) for k in keywords)
+    for domain, keywords in {
         "docker": ["docker", "container", "dockerfile", "compose", "image"],
         "kubernetes": ["kubernetes", "k8s", "kubectl", "pod", "deployment"],
         "infrastructure": ["server", "deploy", "ci/cd", "pipeline", "nginx"],
@@ -91,20 +166,25 @@ def detect_domain(text):
         "file-system": ["file", "fs", "read", "write", "path"],
         "networking": ["http", "fetch", "axios", "request", "socket"],
         "caching": ["cache", "redis", "memoize", "storage"]
-    }
+    }.items()
+}
 
-    detected = []
-    for domain, keywords in domain_keywords.items():
+
+def detect_domain(text):
+    """Detect domain from text content (first matching domain wins)."""
+    text_lower = text.lower()
+
+    for domain, keywords in DOMAIN_KEYWORDS.items():
         for keyword in keywords:
             if keyword in text_lower:
-                detected.append(domain)
-                break
+                return domain
 
-    return detected[0] if detected else "general"
+    return "general"
 
 
 def record_prediction(domain, prediction, outcome, context=None, confidence_given=None):
     """Record a prediction and its outcome."""
+    domain = sys.intern(domain)
     data = load_calibration()
 
     record = {
@@ -116,7 +196,7 @@ def record_prediction(domain, prediction, outcome, context=None, confidence_give
         "confidence_given": confidence_given
     }
 
-    data["predictions"].append(record)
+    _append_prediction(record)
 
     # Update domain stats
     if domain not in data["domain_stats"]:
@@ -131,9 +211,6 @@ def record_prediction(domain, prediction, outcome, context=None, confidence_give
     if outcome in data["overall"]:
         data["overall"][outcome] += 1
 
-    # Keep last 500 predictions
-    data["predictions"] = data["predictions"][-500:]
-
     save_calibration(data)
     return record
 
@@ -13,17 +13,31 @@ Correction signals:
 - "I said X not Y"
 """
 
+import functools
+import heapq
 import json
 import re
 import sys
 from pathlib import Path
 from datetime import datetime, timezone
 
+from _jsonio import json_dumps, json_loads, write_atomic, file_signature
+
+# Optional: Hyperscan compiles the correction patterns to a DFA
+try:
+    import hyperscan
+    HAS_HYPERSCAN = True
+except ImportError:
+    HAS_HYPERSCAN = False
+
 MEMORY_ROOT = Path.home() / ".claude-dash"
 CORRECTIONS_FILE = MEMORY_ROOT / "learning" / "corrections.json"
 
+# Corrections lead a human message; don't scan deep into pasted logs
+DETECT_SCAN_CHARS = 512
+
 # Patterns that indicate user is correcting Claude
-CORRECTION_PATTERNS = [
+_RAW_CORRECTION_PATTERNS = [
     # Explicit corrections
     r"\bno[,.]?\s+(i\s+)?(meant|want|need|said)",
     r"\bthat'?s\s+(wrong|incorrect|not\s+right|not\s+what)",
@@ -62,39 +76,201 @@ CORRECTION_PATTERNS = [
     r"\bstop\s+using\s+",
 ]
 
+CORRECTION_PATTERNS = tuple(re.compile(p) for p in _RAW_CORRECTION_PATTERNS)
+
+# Literals at least one of which every correction pattern requires
+# ("no" also covers "not"); messages with none of them skip regex entirely
+_CORRECTION_ANCHORS = (
+    "no", "that", "actually", "said", "wrong", "didn", "use", "should",
+    "don", "remove", "undo", "revert", "back", "change", "prefer",
+    "always", "never", "stop",
+)
+
+# All correction patterns fused into one alternation: a single scan answers
+# "does anything match?" for the common non-correction message
+_COMBINED_CORRECTION_PATTERN = re.compile(
+    "|".join(f"(?:{p})" for p in _RAW_CORRECTION_PATTERNS)
+)
+
+
+def _build_hyperscan_db():
+    """Compile the correction patterns into a Hyperscan database, or None."""
+    if not HAS_HYPERSCAN:
+        return None
+    try:
+        flags = hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[p.encode() for p in _RAW_CORRECTION_PATTERNS],
+            ids=list(range(len(_RAW_CORRECTION_PATTERNS))),
+            flags=[flags] * len(_RAW_CORRECTION_PATTERNS)
+        )
+        return db
+    except Exception:
+        return None  # Unsupported pattern or build - use the re fallback
+
+
+_HYPERSCAN_DB = _build_hyperscan_db()
+
+
+def _matches_any_correction(message_lower):
+    """True if any correction pattern matches (DFA scan when available)."""
+    if _HYPERSCAN_DB is not None:
+        hits = []
+
+        def on_match(pattern_id, start, end, flags, context):
+            hits.append(pattern_id)
+
+        try:
+            _HYPERSCAN_DB.scan(message_lower.encode("utf-8"), match_event_handler=on_match)
+            return bool(hits)
+        except Exception:
+            pass
+
+    return _COMBINED_CORRECTION_PATTERN.search(message_lower) is not None
+
+
+# Build/error output that looks like a correction but isn't
+BUILD_OUTPUT_PATTERNS = tuple(re.compile(p) for p in [
+    r'^\s*›',                    # Expo/npm progress lines
+    r'^\s*\d+\.\d+\.\d+',        # Version numbers at start
+    r'error\s*\(exit\s*\d+\)',   # Exit codes
+    r'npm\s+(run|install|start|test)',  # npm commands
+    r'compiling\s+\w+\s+pods',   # iOS compilation
+    r'shell\s+cwd\s+was\s+reset', # Shell resets
+    r'http://\d+\.\d+\.\d+\.\d+:\d+',  # IP:port URLs
+    r'waiting\s+for\s+watchman',  # Watchman output
+    r'^\s*at\s+\w+\s+\(',        # Stack traces
+    r'npx\s+expo',               # Expo commands
+    r'eas\s+build',              # EAS commands
+])
+
+# Clear correction signals required by is_quality_correction()
+CLEAR_SIGNAL_PATTERNS = tuple(re.compile(p) for p in [
+    r'\bno[,.]?\s+i\s+meant\b',
+    r'\bno[,.]?\s+use\b',
+    r'\bactually[,.]?\s+i\s+(want|meant|need)\b',
+    r'\buse\s+\w+\s+not\s+\w+\b',
+    r'\buse\s+\w+\s+instead\b',
+    r"\bi\s+prefer\b",
+    r"\balways\s+use\b",
+    r"\bnever\s+use\b",
+])
+
+# Extraction patterns for extract_correction_context(), tried in order
+_PAT_USE_NOT = re.compile(r"use\s+([^\s,]+(?:\s+[^\s,]+)?)\s+(?:not|instead\s+of)\s+([^\s,]+)")
+_PAT_MEANT = re.compile(r"(?:no[,.]?\s+)?i\s+meant\s+(?:use\s+)?([^\s,]+(?:\.[^\s,]+)?)")
+_PAT_SHOULD_BE = re.compile(r"should\s+be\s+([^\s,]+)\s+not\s+([^\s,]+)")
+_PAT_ITS_NOT = re.compile(r"it'?s\s+([^\s,]+(?:\.[^\s,]+)?)\s+not\s+([^\s,]+)")
+_PAT_PREFER_OVER = re.compile(r"prefer\s+([^\s,]+)\s+over\s+([^\s,]+)")
+_PAT_ALWAYS_USE = re.compile(r"always\s+use\s+([^\s,]+(?:[\s-]+\w+)?)")
+_PAT_DONT_USE = re.compile(r"(?:don'?t|never|stop)\s+(?:use|using)\s+([^\s,]+(?:\s+\w+)?)")
+_PAT_DO_NOT = re.compile(r"do\s+not\s+(?:add|do|make|create|put)\s+([^\s,]+(?:\s+[^\s,]+)?)")
+_PAT_HAVE_NOW = re.compile(r"(?:have|using?)\s+([^\s,]+)\s+(?:now|instead)")
+
+# Term extraction for relevance scoring
+_TERM_PATTERN = re.compile(r'\b\w{4,}\b')
+
+
+# In-process cache of corrections.json, keyed by (mtime_ns, size)
+_corrections_cache = None
+_corrections_cache_key = None
+# Hash of the last payload written, to skip rewriting identical content
+_last_saved_hash = None
+
+
+def extract_terms(text):
+    """Key terms (4+ char words) of a text, lowercased, sorted and unique."""
+    return sorted(set(_TERM_PATTERN.findall(text.lower())))
+
+
+def _correction_terms(correction):
+    """Terms of a stored correction's message + previous context."""
+    return extract_terms(correction.get("user_message", "") + " " +
+                         (correction.get("previous_context") or ""))
+
 
 def load_corrections():
-    """Load corrections database."""
-    if not CORRECTIONS_FILE.exists():
+    """Load corrections database (re-read only when the file changes)."""
+    global _corrections_cache, _corrections_cache_key
+
+    key = file_signature(CORRECTIONS_FILE)
+    if key is None:
         return {"corrections": [], "patterns": {}}
 
+    if key == _corrections_cache_key and _corrections_cache is not None:
+        return _corrections_cache
+
     try:
-        return json.loads(CORRECTIONS_FILE.read_text())
+        data = json_loads(CORRECTIONS_FILE.read_bytes())
     except:
         return {"corrections": [], "patterns": {}}
 
+    # Backfill term lists for corrections recorded before they were stored
+    missing = [c for c in data.get("corrections", []) if "_terms" not in c]
+    if missing:
+        for correction in missing:
+            correction["_terms"] = _correction_terms(correction)
+        try:
+            save_corrections(data)
+            return data
+        except OSError:
+            pass
+
+    _corrections_cache = data
+    _corrections_cache_key = key
+    return data
+
 
 def save_corrections(data):
-    """Save corrections database."""
-    CORRECTIONS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    CORRECTIONS_FILE.write_text(json.dumps(data, indent=2))
+    """Save corrections database (atomic, skipped when nothing changed)."""
+    global _corrections_cache, _corrections_cache_key, _last_saved_hash
 
+    payload = json_dumps(data)
+    payload_hash = hash(payload)
+    if payload_hash == _last_saved_hash and CORRECTIONS_FILE.exists():
+        return
 
-def detect_correction(message):
-    """Detect if message contains a correction."""
-    message_lower = message.lower()
+    write_atomic(CORRECTIONS_FILE, payload)
+    _last_saved_hash = payload_hash
+
+    # Keep the cache warm so the writer doesn't invalidate itself
+    _corrections_cache = data
+    _corrections_cache_key = file_signature(CORRECTIONS_FILE)
+
+
+@functools.lru_cache(maxsize=1024)
+def _detect_in_lowered(message_lower):
+    """Match a lowercased message; returns (pattern, matched_text) or None."""
+    if not any(a in message_lower for a in _CORRECTION_ANCHORS):
+        return None
 
+    if not _matches_any_correction(message_lower):
+        return None
+
+    # Report the first pattern in priority order (not leftmost match)
     for pattern in CORRECTION_PATTERNS:
-        match = re.search(pattern, message_lower)
+        match = pattern.search(message_lower)
         if match:
-            return {
-                "is_correction": True,
-                "pattern": pattern,
-                "matched_text": match.group(0),
-                "full_message": message
-            }
+            return pattern.pattern, match.group(0)
+
+    return None
 
-    return {"is_correction": False}
+
+def detect_correction(message):
+    """Detect if message contains a correction (within its first DETECT_SCAN_CHARS)."""
+    # Cached: hooks may probe the same message more than once per turn
+    hit = _detect_in_lowered(message[:DETECT_SCAN_CHARS].lower())
+    if hit is None:
+        return {"is_correction": False}
+
+    pattern, matched_text = hit
+    return {
+        "is_correction": True,
+        "pattern": pattern,
+        "matched_text": matched_text,
+        "full_message": message
+    }
 
 
 def extract_correction_context(message, previous_context=None):
@@ -108,59 +284,59 @@ def extract_correction_context(message, previous_context=None):
     msg_lower = message.lower()
 
     # Pattern 1: "use X not Y" or "use X instead of Y"
-    use_not_match = re.search(r"use\s+([^\s,]+(?:\s+[^\s,]+)?)\s+(?:not|instead\s+of)\s+([^\s,]+)", msg_lower)
+    use_not_match = _PAT_USE_NOT.search(msg_lower)
     if use_not_match:
         correction["correct"] = use_not_match.group(1)
         correction["wrong"] = use_not_match.group(2)
         return correction
 
     # Pattern 2: "no, I meant X" or "I meant X not Y"
-    meant_match = re.search(r"(?:no[,.]?\s+)?i\s+meant\s+(?:use\s+)?([^\s,]+(?:\.[^\s,]+)?)", msg_lower)
+    meant_match = _PAT_MEANT.search(msg_lower)
     if meant_match:
         correction["correct"] = meant_match.group(1)
         return correction
 
     # Pattern 3: "should be X not Y"
-    should_be_match = re.search(r"should\s+be\s+([^\s,]+)\s+not\s+([^\s,]+)", msg_lower)
+    should_be_match = _PAT_SHOULD_BE.search(msg_lower)
     if should_be_match:
         correction["correct"] = should_be_match.group(1)
         correction["wrong"] = should_be_match.group(2)
         return correction
 
     # Pattern 4: "it's X not Y" (capturing multi-part identifiers)
-    its_not_match = re.search(r"it'?s\s+([^\s,]+(?:\.[^\s,]+)?)\s+not\s+([^\s,]+)", msg_lower)
+    its_not_match = _PAT_ITS_NOT.search(msg_lower)
     if its_not_match:
         correction["correct"] = its_not_match.group(1)
         correction["wrong"] = its_not_match.group(2)
         return correction
 
     # Pattern 5: "prefer X over Y"
-    prefer_over_match = re.search(r"prefer\s+([^\s,]+)\s+over\s+([^\s,]+)", msg_lower)
+    prefer_over_match = _PAT_PREFER_OVER.search(msg_lower)
     if prefer_over_match:
         correction["correct"] = prefer_over_match.group(1)
         correction["wrong"] = prefer_over_match.group(2)
         return correction
 
     # Pattern 6: "always use X"
-    always_match = re.search(r"always\s+use\s+([^\s,]+(?:[\s-]+\w+)?)", msg_lower)
+    always_match = _PAT_ALWAYS_USE.search(msg_lower)
     if always_match:
         correction["correct"] = always_match.group(1)
         return correction
 
     # Pattern 7: "don't use X" or "never use X" or "stop using X"
-    dont_match = re.search(r"(?:don'?t|never|stop)\s+(?:use|using)\s+([^\s,]+(?:\s+\w+)?)", msg_lower)
+    dont_match = _PAT_DONT_USE.search(msg_lower)
     if dont_match:
         correction["wrong"] = dont_match.group(1)
         return correction
 
     # Pattern 8: "do not add/do/make X"
-    donot_match = re.search(r"do\s+not\s+(?:add|do|make|create|put)\s+([^\s,]+(?:\s+[^\s,]+)?)", msg_lower)
+    donot_match = _PAT_DO_NOT.search(msg_lower)
     if donot_match:
         correction["wrong"] = donot_match.group(1)
         return correction
 
     # Pattern 9: "uses X instead" or "have X now"
-    have_now_match = re.search(r"(?:have|using?)\s+([^\s,]+)\s+(?:now|instead)", msg_lower)
+    have_now_match = _PAT_HAVE_NOW.search(msg_lower)
     if have_now_match:
         correction["correct"] = have_now_match.group(1)
         return correction
@@ -173,22 +349,8 @@ def is_quality_correction(message):
     msg = message.lower()
 
     # Skip if message looks like build/error output (common false positives)
-    build_output_patterns = [
-        r'^\s*›',                    # Expo/npm progress lines
-        r'^\s*\d+\.\d+\.\d+',        # Version numbers at start
-        r'error\s*\(exit\s*\d+\)',   # Exit codes
-        r'npm\s+(run|install|start|test)',  # npm commands
-        r'compiling\s+\w+\s+pods',   # iOS compilation
-        r'shell\s+cwd\s+was\s+reset', # Shell resets
-        r'http://\d+\.\d+\.\d+\.\d+:\d+',  # IP:port URLs
-        r'waiting\s+for\s+watchman',  # Watchman output
-        r'^\s*at\s+\w+\s+\(',        # Stack traces
-        r'npx\s+expo',               # Expo commands
-        r'eas\s+build',              # EAS commands
-    ]
-
-    for pattern in build_output_patterns:
-        if re.search(pattern, msg):
+    for pattern in BUILD_OUTPUT_PATTERNS:
+        if pattern.search(msg):
             return False
 
     # Skip if message is too long (likely pasted output, not a correction)
@@ -200,22 +362,31 @@ def is_quality_correction(message):
         return False
 
     # Must have a clear correction signal (not just matching a vague pattern)
-    clear_signals = [
-        r'\bno[,.]?\s+i\s+meant\b',
-        r'\bno[,.]?\s+use\b',
-        r'\bactually[,.]?\s+i\s+(want|meant|need)\b',
-        r'\buse\s+\w+\s+not\s+\w+\b',
-        r'\buse\s+\w+\s+instead\b',
-        r"\bi\s+prefer\b",
-        r"\balways\s+use\b",
-        r"\bnever\s+use\b",
-    ]
-
-    has_clear_signal = any(re.search(p, msg) for p in clear_signals)
+    has_clear_signal = any(p.search(msg) for p in CLEAR_SIGNAL_PATTERNS)
 
     return has_clear_signal
 
 
+_record_trajectory = None
+_record_trajectory_resolved = False
+
+
+def _get_record_trajectory():
+    """Resolve reasoning_bank.record_trajectory once; None if unavailable.
+
+    Kept lazy so detect-only callers never pay for importing reasoning_bank.
+    """
+    global _record_trajectory, _record_trajectory_resolved
+    if not _record_trajectory_resolved:
+        _record_trajectory_resolved = True
+        try:
+            from reasoning_bank import record_trajectory
+            _record_trajectory = record_trajectory
+        except ImportError:
+            _record_trajectory = None  # ReasoningBank not available
+    return _record_trajectory
+
+
 def record_correction(message, previous_context=None, topic=None, project_id=None):
     """Record a correction for future learning."""
     # Quality filter - skip false positives
@@ -227,6 +398,8 @@ def record_correction(message, previous_context=None, topic=None, project_id=Non
     correction = extract_correction_context(message, previous_context)
     correction["topic"] = topic
     correction["project_id"] = project_id
+    # Tokenized once here so find_relevant_corrections() needs no regex per entry
+    correction["_terms"] = _correction_terms(correction)
 
     data["corrections"].append(correction)
 
@@ -246,9 +419,10 @@ def record_correction(message, previous_context=None, topic=None, project_id=Non
     # === REASONING BANK INTEGRATION ===
     # Only record to ReasoningBank if we extracted a meaningful correction
     # Don't pollute with garbage solutions
-    if correction.get("correct") or correction.get("wrong"):
+    meaningful = correction.get("correct") or correction.get("wrong")
+    record_trajectory = _get_record_trajectory() if meaningful else None
+    if record_trajectory:
         try:
-            from reasoning_bank import record_trajectory
             # Build meaningful solution string
             solution_parts = []
             if correction.get("correct"):
@@ -264,8 +438,6 @@ def record_correction(message, previous_context=None, topic=None, project_id=Non
                 domain=topic,
                 project_id=project_id
             )
-        except ImportError:
-            pass  # ReasoningBank not available
         except Exception:
             pass  # Non-critical - don't fail correction recording
 
@@ -281,35 +453,32 @@ def find_relevant_corrections(context, topic=None, limit=3):
         return []
 
     context_lower = context.lower()
-    relevant = []
+    scored = []
 
     # Extract key terms from context
-    context_terms = set(re.findall(r'\b\w{4,}\b', context_lower))
+    context_terms = set(_TERM_PATTERN.findall(context_lower))
 
-    for correction in reversed(corrections):  # Most recent first
+    for i, correction in enumerate(reversed(corrections)):  # Most recent first
         score = 0
 
         # Check topic match
         if topic and correction.get("topic") == topic:
             score += 2
 
-        # Check term overlap
-        correction_text = (correction.get("user_message", "") + " " +
-                          (correction.get("previous_context") or "")).lower()
-        correction_terms = set(re.findall(r'\b\w{4,}\b', correction_text))
+        # Check term overlap against the stored (unique) term list
+        correction_terms = correction.get("_terms")
+        if correction_terms is None:
+            correction_terms = _correction_terms(correction)
 
-        overlap = len(context_terms & correction_terms)
+        overlap = len(context_terms.intersection(correction_terms))
         score += overlap
 
         if score > 0:
-            relevant.append({
-                "score": score,
-                "correction": correction
-            })
-
-    # Sort by score and return top N
-    relevant.sort(key=lambda x: x["score"], reverse=True)
-    return [r["correction"] for r in relevant[:limit]]
+            # -i breaks ties in favour of the most recent correction
+            scored.append((score, -i, correction))
+
+    # Top N by score without sorting every candidate
+    return [c for _, _, c in heapq.nlargest(limit, scored)]
 
 
 def format_corrections_for_injection(corrections):
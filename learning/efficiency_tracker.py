@@ -13,26 +13,48 @@ Usage:
     python3 efficiency_tracker.py --record <metric> <value>
     python3 efficiency_tracker.py --report
     python3 efficiency_tracker.py --trends
+    python3 efficiency_tracker.py --reindex
 """
 
+import copy
+import functools
+import heapq
 import json
 import os
 import sys
-from datetime import datetime, timedelta
+import time
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from collections import defaultdict
+from dataclasses import dataclass
+
+from _jsonio import json_dumps, write_atomic
+
+# Optional: ijson streams records instead of materializing whole files
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
 
 MEMORY_ROOT = Path.home() / ".claude-dash"
 METRICS_FILE = MEMORY_ROOT / "learning" / "efficiency_metrics.json"
 CORRECTIONS_FILE = MEMORY_ROOT / "learning" / "corrections.json"
 OUTCOMES_FILE = MEMORY_ROOT / "learning" / "outcomes.json"
+ROLLUPS_FILE = MEMORY_ROOT / "learning" / "weekly_rollups.json"
 SESSIONS_DIR = MEMORY_ROOT / "sessions"
 
-def load_metrics():
-    """Load metrics history."""
+@functools.lru_cache(maxsize=1)
+def _metrics_snapshot():
+    """Parsed metrics file, shared across calls; only load_metrics() may read it."""
     if METRICS_FILE.exists():
         with open(METRICS_FILE) as f:
-            return json.load(f)
+            metrics = json.load(f)
+        lifetime = metrics.setdefault("lifetime", {})
+        if "total_memory_misses" not in lifetime:
+            # Files written before misses were tracked in lifetime
+            lifetime["total_memory_misses"] = _sum_daily(metrics, ("memory_misses",))["memory_misses"]
+        return metrics
     return {
         "daily": {},  # date -> metrics
         "weekly": {},  # week -> aggregated metrics
@@ -40,6 +62,7 @@ def load_metrics():
             "total_sessions": 0,
             "total_corrections": 0,
             "total_memory_hits": 0,
+            "total_memory_misses": 0,
             "total_file_reads_avoided": 0,
             "estimated_tokens_saved": 0,
             "first_attempt_successes": 0,
@@ -47,11 +70,16 @@ def load_metrics():
         }
     }
 
+def load_metrics():
+    """Load metrics history (parsed once per process; callers get their own copy)."""
+    return copy.deepcopy(_metrics_snapshot())
+
 def save_metrics(metrics):
     """Save metrics."""
-    METRICS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(METRICS_FILE, 'w') as f:
-        json.dump(metrics, f, indent=2)
+    try:
+        write_atomic(METRICS_FILE, json_dumps(metrics, indent=True))
+    finally:
+        _metrics_snapshot.cache_clear()
 
 def get_today():
     return datetime.now().strftime("%Y-%m-%d")
@@ -89,6 +117,7 @@ def record_metric(metric_name, value, project_id=None):
         "sessions": "total_sessions",
         "corrections": "total_corrections",
         "memory_hits": "total_memory_hits",
+        "memory_misses": "total_memory_misses",
         "file_reads_avoided": "total_file_reads_avoided",
         "tokens_saved": "estimated_tokens_saved",
         "first_attempt_success": "first_attempt_successes",
@@ -96,105 +125,214 @@ def record_metric(metric_name, value, project_id=None):
     }
 
     if metric_name in lifetime_map:
-        metrics["lifetime"][lifetime_map[metric_name]] += value
+        lifetime_key = lifetime_map[metric_name]
+        metrics["lifetime"][lifetime_key] = metrics["lifetime"].get(lifetime_key, 0) + value
 
     save_metrics(metrics)
     return metrics
 
-def count_corrections():
-    """Count total corrections from corrections.json."""
-    if not CORRECTIONS_FILE.exists():
-        return 0, {}
-
-    with open(CORRECTIONS_FILE) as f:
-        data = json.load(f)
+def _week_key(ts):
+    """Week key ("YYYY-Www", strftime %W) for an ISO timestamp, or None.
+
+    The week only depends on the date part, so only the first 10 characters
+    are looked at; _week_of_date caches per day since timestamps rarely repeat.
+    """
+    if not isinstance(ts, str) or len(ts) < 10 or ts[10:11] not in ("", "T", " "):
+        return None
+    return _week_of_date(ts[:10])
+
+@functools.lru_cache(maxsize=4096)
+def _week_of_date(day):
+    """Week key for a "YYYY-MM-DD" string, or None if it isn't one."""
+    if day[4] != "-" or day[7] != "-":
+        return None
+    try:
+        d = date(int(day[0:4]), int(day[5:7]), int(day[8:10]))
+    except ValueError:
+        return None
+    # %W: weeks start on Monday; days before the year's first Monday are week 0
+    yday = d.toordinal() - date(d.year, 1, 1).toordinal()
+    week = (yday + 7 - d.weekday()) // 7
+    return f"{d.year:04d}-W{week:02d}"
+
+def _iter_records(path, key):
+    """Yield the records stored under `key` in path.
+
+    An append-only JSONL log next to path (same name, .jsonl) is read line by
+    line when present; otherwise the top-level `key` array in path is streamed
+    with ijson when available. Missing files yield nothing.
+    """
+    log_path = path.with_suffix(".jsonl")
+    if log_path.exists():
+        with open(log_path, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # Torn final line from an interrupted append
+                    continue
+        return
+
+    if not path.exists():
+        return
+    with open(path, "rb") as f:
+        if HAS_IJSON:
+            yield from ijson.items(f, f"{key}.item")
+        else:
+            yield from json.load(f).get(key, [])
 
-    corrections = data.get("corrections", [])
-    total = len(corrections)
+def _source_key(path):
+    """[name, mtime_ns, size] of the file _iter_records would read for path."""
+    for p in (path.with_suffix(".jsonl"), path):
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        return [p.name, st.st_mtime_ns, st.st_size]
+    return None
+
+@functools.lru_cache(maxsize=1)
+def _load_rollups():
+    """Load persisted weekly rollups (parsed once per process)."""
+    try:
+        with open(ROLLUPS_FILE) as f:
+            return json.load(f)
+    except:
+        return {}
+
+def _save_rollups(rollups):
+    """Save weekly rollups atomically."""
+    _load_rollups.cache_clear()
+    write_atomic(ROLLUPS_FILE, json_dumps(rollups))
+
+def _rolled_up(name, path, scan, reindex=False):
+    """Return scan()'s (totals, by_week), reusing the persisted rollup while
+    the source file is unchanged and rescanning only when it moved on."""
+    source = _source_key(path)
+    cached = _load_rollups().get(name)
+    if not reindex and cached and cached.get("source") == source:
+        return tuple(cached["result"])
+
+    result = scan()
+    rollups = dict(_load_rollups())
+    rollups[name] = {"source": source, "result": list(result)}
+    try:
+        _save_rollups(rollups)
+    except OSError:
+        pass
+    return result
+
+def count_corrections(reindex=False):
+    """Count total corrections, using the weekly rollup when it is current."""
+    return _rolled_up("corrections", CORRECTIONS_FILE, _scan_corrections, reindex)
+
+def count_outcomes(reindex=False):
+    """Analyze outcomes, using the weekly rollup when it is current."""
+    return _rolled_up("outcomes", OUTCOMES_FILE, _scan_outcomes, reindex)
+
+def _scan_corrections():
+    """Count total corrections from the corrections log (or corrections.json)."""
+    total = 0
 
     # Group by week
     by_week = defaultdict(int)
-    for c in corrections:
-        ts = c.get("timestamp", "")
-        if ts:
-            try:
-                dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
-                week = dt.strftime("%Y-W%W")
-                by_week[week] += 1
-            except:
-                pass
+    for c in _iter_records(CORRECTIONS_FILE, "corrections"):
+        total += 1
+        week = _week_key(c.get("timestamp", ""))
+        if week:
+            by_week[week] += 1
 
     return total, dict(by_week)
 
-def count_outcomes():
-    """Analyze outcomes from outcomes.json."""
-    if not OUTCOMES_FILE.exists():
-        return {"success": 0, "failure": 0, "partial": 0}, {}
-
-    with open(OUTCOMES_FILE) as f:
-        data = json.load(f)
-
-    outcomes = data.get("outcomes", [])
+def _scan_outcomes():
+    """Analyze outcomes from the outcomes log (or outcomes.json)."""
     counts = {"success": 0, "failure": 0, "partial": 0}
     by_week = defaultdict(lambda: {"success": 0, "failure": 0, "partial": 0})
 
-    for o in outcomes:
+    for o in _iter_records(OUTCOMES_FILE, "outcomes"):
         outcome = o.get("outcome", "")
         if outcome in counts:
             counts[outcome] += 1
 
-        ts = o.get("timestamp", "")
-        if ts:
-            try:
-                dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
-                week = dt.strftime("%Y-W%W")
-                if outcome in by_week[week]:
-                    by_week[week][outcome] += 1
-            except:
-                pass
+        week = _week_key(o.get("timestamp", ""))
+        if week and outcome in by_week[week]:
+            by_week[week][outcome] += 1
 
     return counts, dict(by_week)
 
 def count_sessions():
     """Count sessions from transcripts."""
     transcripts_dir = SESSIONS_DIR / "transcripts"
-    if not transcripts_dir.exists():
-        return 0, {}
-
-    sessions = list(transcripts_dir.glob("*.jsonl"))
-    total = len(sessions)
-
+    total = 0
     by_week = defaultdict(int)
-    for s in sessions:
-        try:
-            # Get file modification time
-            mtime = datetime.fromtimestamp(s.stat().st_mtime)
-            week = mtime.strftime("%Y-W%W")
-            by_week[week] += 1
-        except:
-            pass
+
+    # scandir's DirEntry caches the stat, so each transcript costs one syscall
+    try:
+        with os.scandir(transcripts_dir) as it:
+            for entry in it:
+                if entry.name.startswith(".") or not entry.name.endswith(".jsonl"):
+                    continue
+                total += 1
+                try:
+                    # Get file modification time
+                    week = time.strftime("%Y-W%W", time.localtime(entry.stat().st_mtime))
+                    by_week[week] += 1
+                except:
+                    pass
+    except OSError:
+        return 0, {}
 
     return total, dict(by_week)
 
-def estimate_token_savings():
+def _sum_daily(metrics, keys):
+    """Sum several daily counters in a single pass over metrics["daily"]."""
+    totals = dict.fromkeys(keys, 0)
+    for d in metrics["daily"].values():
+        for k in keys:
+            totals[k] += d.get(k, 0)
+    return totals
+
+@dataclass
+class Stats:
+    """Every data source the score, trends and report read, loaded once."""
+    corrections_total: int
+    corrections_by_week: dict
+    outcomes: dict
+    outcomes_by_week: dict
+    sessions_total: int
+    sessions_by_week: dict
+    metrics: dict
+
+def gather_stats():
+    """Count corrections, outcomes and sessions and load metrics in one go."""
+    corrections_total, corrections_by_week = count_corrections()
+    outcomes, outcomes_by_week = count_outcomes()
+    sessions_total, sessions_by_week = count_sessions()
+    return Stats(
+        corrections_total=corrections_total,
+        corrections_by_week=corrections_by_week,
+        outcomes=outcomes,
+        outcomes_by_week=outcomes_by_week,
+        sessions_total=sessions_total,
+        sessions_by_week=sessions_by_week,
+        metrics=load_metrics()
+    )
+
+def estimate_token_savings(stats=None):
     """Estimate tokens saved by memory system."""
-    metrics = load_metrics()
+    metrics = stats.metrics if stats else load_metrics()
 
     # Rough estimates based on typical usage
     TOKENS_PER_FILE_READ = 1500  # Average file is ~1500 tokens
     TOKENS_PER_MEMORY_HIT = 200  # Memory summary is ~200 tokens
     TOKENS_PER_CONTEXT_INJECTION = 150  # Context blocks are ~150 tokens each
 
-    # Calculate from daily metrics
-    total_memory_hits = sum(
-        d.get("memory_hits", 0)
-        for d in metrics["daily"].values()
-    )
-
-    total_file_reads_avoided = sum(
-        d.get("file_reads_avoided", 0)
-        for d in metrics["daily"].values()
-    )
+    # Lifetime counters are kept up to date by record_metric
+    lifetime = metrics["lifetime"]
+    total_memory_hits = lifetime.get("total_memory_hits", 0)
+    total_file_reads_avoided = lifetime.get("total_file_reads_avoided", 0)
 
     # Estimate savings
     saved_from_memory = total_memory_hits * (TOKENS_PER_FILE_READ - TOKENS_PER_MEMORY_HIT)
@@ -208,11 +346,12 @@ def estimate_token_savings():
         "files_avoided": total_file_reads_avoided
     }
 
-def calculate_efficiency_score():
+def calculate_efficiency_score(stats=None):
     """Calculate overall efficiency score (0-100)."""
-    total_corrections, corrections_by_week = count_corrections()
-    outcomes, outcomes_by_week = count_outcomes()
-    total_sessions, sessions_by_week = count_sessions()
+    stats = stats or gather_stats()
+    total_corrections, corrections_by_week = stats.corrections_total, stats.corrections_by_week
+    outcomes = stats.outcomes
+    total_sessions = stats.sessions_total
 
     # Components of efficiency score
     scores = {}
@@ -227,10 +366,10 @@ def calculate_efficiency_score():
 
     # 2. Correction rate improvement (30% weight)
     # Compare recent corrections to earlier corrections
-    weeks = sorted(corrections_by_week.keys())
-    if len(weeks) >= 2:
-        recent_weeks = weeks[-2:]
-        early_weeks = weeks[:2] if len(weeks) >= 4 else weeks[:1]
+    # Only the first and last couple of weeks matter, so skip the full sort
+    if len(corrections_by_week) >= 2:
+        recent_weeks = heapq.nlargest(2, corrections_by_week)
+        early_weeks = heapq.nsmallest(2 if len(corrections_by_week) >= 4 else 1, corrections_by_week)
 
         recent_avg = sum(corrections_by_week[w] for w in recent_weeks) / len(recent_weeks)
         early_avg = sum(corrections_by_week[w] for w in early_weeks) / len(early_weeks)
@@ -244,9 +383,9 @@ def calculate_efficiency_score():
         scores["correction_improvement"] = 50
 
     # 3. Memory utilization (30% weight)
-    metrics = load_metrics()
-    total_memory_hits = sum(d.get("memory_hits", 0) for d in metrics["daily"].values())
-    total_misses = sum(d.get("memory_misses", 0) for d in metrics["daily"].values())
+    lifetime = stats.metrics["lifetime"]
+    total_memory_hits = lifetime.get("total_memory_hits", 0)
+    total_misses = lifetime.get("total_memory_misses", 0)
 
     if total_memory_hits + total_misses > 0:
         hit_rate = total_memory_hits / (total_memory_hits + total_misses)
@@ -271,15 +410,16 @@ def calculate_efficiency_score():
         }
     }
 
-def calculate_trends():
+def calculate_trends(stats=None):
     """Calculate week-over-week trends."""
-    total_corrections, corrections_by_week = count_corrections()
-    outcomes, outcomes_by_week = count_outcomes()
-    total_sessions, sessions_by_week = count_sessions()
+    stats = stats or gather_stats()
+    corrections_by_week = stats.corrections_by_week
+    outcomes_by_week = stats.outcomes_by_week
+    sessions_by_week = stats.sessions_by_week
 
     # Get all weeks
     all_weeks = set(corrections_by_week.keys()) | set(outcomes_by_week.keys()) | set(sessions_by_week.keys())
-    weeks = sorted(all_weeks)[-8:]  # Last 8 weeks
+    weeks = sorted(heapq.nlargest(8, all_weeks))  # Last 8 weeks
 
     trends = []
     for week in weeks:
@@ -303,17 +443,17 @@ def calculate_trends():
 
     return trends
 
-def generate_report():
-    """Generate efficiency report."""
-    efficiency = calculate_efficiency_score()
-    trends = calculate_trends()
-    token_savings = estimate_token_savings()
+def _report_lines():
+    """Yield the efficiency report line by line."""
+    stats = gather_stats()
+    efficiency = calculate_efficiency_score(stats)
+    trends = calculate_trends(stats)
+    token_savings = estimate_token_savings(stats)
 
-    report = []
-    report.append("=" * 60)
-    report.append("CLAUDE-DASH EFFICIENCY REPORT")
-    report.append("=" * 60)
-    report.append("")
+    yield "=" * 60
+    yield "CLAUDE-DASH EFFICIENCY REPORT"
+    yield "=" * 60
+    yield ""
 
     # Overall score
     score = efficiency["overall"]
@@ -326,47 +466,47 @@ def generate_report():
     else:
         grade = "D - Needs improvement"
 
-    report.append(f"Overall Efficiency Score: {score}/100 ({grade})")
-    report.append("")
+    yield f"Overall Efficiency Score: {score}/100 ({grade})"
+    yield ""
 
     # Component breakdown
-    report.append("Component Scores:")
+    yield "Component Scores:"
     for name, value in efficiency["components"].items():
         bar = "█" * int(value / 10) + "░" * (10 - int(value / 10))
-        report.append(f"  {name:25} [{bar}] {value:.1f}")
-    report.append("")
+        yield f"  {name:25} [{bar}] {value:.1f}"
+    yield ""
 
     # Stats
     data = efficiency["data"]
-    report.append("Lifetime Statistics:")
-    report.append(f"  Total sessions:     {data['total_sessions']}")
-    report.append(f"  Total corrections:  {data['total_corrections']}")
-    report.append(f"  Outcomes tracked:   {sum(data['outcomes'].values())}")
-    report.append(f"    - Success:        {data['outcomes']['success']}")
-    report.append(f"    - Partial:        {data['outcomes']['partial']}")
-    report.append(f"    - Failure:        {data['outcomes']['failure']}")
-    report.append("")
+    yield "Lifetime Statistics:"
+    yield f"  Total sessions:     {data['total_sessions']}"
+    yield f"  Total corrections:  {data['total_corrections']}"
+    yield f"  Outcomes tracked:   {sum(data['outcomes'].values())}"
+    yield f"    - Success:        {data['outcomes']['success']}"
+    yield f"    - Partial:        {data['outcomes']['partial']}"
+    yield f"    - Failure:        {data['outcomes']['failure']}"
+    yield ""
 
     # Token savings
-    report.append("Estimated Token Savings:")
-    report.append(f"  Memory hits:        {token_savings['memory_hits']} queries served from memory")
-    report.append(f"  Files avoided:      {token_savings['files_avoided']} file reads skipped")
-    report.append(f"  Tokens saved:       ~{token_savings['total_estimated_savings']:,}")
-    report.append("")
+    yield "Estimated Token Savings:"
+    yield f"  Memory hits:        {token_savings['memory_hits']} queries served from memory"
+    yield f"  Files avoided:      {token_savings['files_avoided']} file reads skipped"
+    yield f"  Tokens saved:       ~{token_savings['total_estimated_savings']:,}"
+    yield ""
 
     # Trends
     if trends:
-        report.append("Weekly Trends (last 8 weeks):")
-        report.append("-" * 60)
-        report.append(f"{'Week':<12} {'Sessions':>10} {'Corrections':>12} {'Corr/Sess':>10} {'Success%':>10}")
-        report.append("-" * 60)
+        yield "Weekly Trends (last 8 weeks):"
+        yield "-" * 60
+        yield f"{'Week':<12} {'Sessions':>10} {'Corrections':>12} {'Corr/Sess':>10} {'Success%':>10}"
+        yield "-" * 60
 
         for t in trends:
             cps = f"{t['corrections_per_session']:.2f}" if t['corrections_per_session'] is not None else "-"
             sr = f"{t['success_rate']:.0f}%" if t['success_rate'] is not None else "-"
-            report.append(f"{t['week']:<12} {t['sessions']:>10} {t['corrections']:>12} {cps:>10} {sr:>10}")
+            yield f"{t['week']:<12} {t['sessions']:>10} {t['corrections']:>12} {cps:>10} {sr:>10}"
 
-        report.append("")
+        yield ""
 
         # Trend analysis
         if len(trends) >= 4:
@@ -382,17 +522,19 @@ def generate_report():
 
                 if recent_avg < early_avg:
                     improvement = (early_avg - recent_avg) / early_avg * 100
-                    report.append(f"📉 Corrections per session decreased by {improvement:.0f}% (improving!)")
+                    yield f"📉 Corrections per session decreased by {improvement:.0f}% (improving!)"
                 elif recent_avg > early_avg:
                     increase = (recent_avg - early_avg) / early_avg * 100
-                    report.append(f"📈 Corrections per session increased by {increase:.0f}%")
+                    yield f"📈 Corrections per session increased by {increase:.0f}%"
                 else:
-                    report.append("➡️  Correction rate stable")
+                    yield "➡️  Correction rate stable"
 
-    report.append("")
-    report.append("=" * 60)
+    yield ""
+    yield "=" * 60
 
-    return "\n".join(report)
+def generate_report():
+    """Generate efficiency report."""
+    return "\n".join(_report_lines())
 
 def project_future_efficiency(weeks_ahead=12):
     """Project efficiency improvements based on current trends."""
@@ -473,6 +615,7 @@ def main():
     parser.add_argument("--project", type=int, metavar="WEEKS",
                        help="Project efficiency N weeks ahead")
     parser.add_argument("--score", action="store_true", help="Show efficiency score only")
+    parser.add_argument("--reindex", action="store_true", help="Rebuild weekly rollups from scratch")
 
     args = parser.parse_args()
 
@@ -487,7 +630,8 @@ def main():
             sys.exit(1)
 
     elif args.report:
-        print(generate_report())
+        for line in _report_lines():
+            print(line)
 
     elif args.trends:
         trends = calculate_trends()
@@ -497,6 +641,12 @@ def main():
     elif args.project:
         print(project_future_efficiency(args.project))
 
+    elif args.reindex:
+        total_corrections, corrections_by_week = count_corrections(reindex=True)
+        outcomes, outcomes_by_week = count_outcomes(reindex=True)
+        weeks = set(corrections_by_week) | set(outcomes_by_week)
+        print(f"Reindexed {total_corrections} corrections and {sum(outcomes.values())} outcomes across {len(weeks)} weeks")
+
     elif args.score:
         efficiency = calculate_efficiency_score()
         print(f"Efficiency Score: {efficiency['overall']}/100")
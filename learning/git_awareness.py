@@ -9,13 +9,27 @@ Usage:
   python git_awareness.py /path/to/project [--since "2024-01-10"]
 """
 
+import hashlib
 import json
+import re
 import subprocess
 import sys
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
 
+from _jsonio import json_dumps, json_loads, write_atomic
+
 MEMORY_ROOT = Path.home() / ".claude-dash"
+GIT_CACHE_DIR = MEMORY_ROOT / "cache" / "git"
+
+# Allow ISO dates, relative dates like "7 days ago", or simple formats
+_SAFE_DATE_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'^\d{4}-\d{2}-\d{2}$',  # YYYY-MM-DD
+    r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}',  # ISO format
+    r'^\d+\s+(day|week|month|year)s?\s+ago$',  # Relative dates
+    r'^yesterday$',
+    r'^last\s+(week|month|year)$',
+))
 
 
 def get_last_session_time(project_id):
@@ -60,18 +74,42 @@ def run_git_command(args, cwd):
         return None
 
 
+COMMIT_GRAPH_MARKER = ".claude-dash-commit-graph-written"
+
+
+def ensure_commit_graph(project_path):
+    """Write a commit-graph (with changed-path filters) once per repo.
+
+    git log on long histories is much faster with a commit-graph. The write
+    runs as a detached process so the caller never waits on it; a marker
+    file inside .git prevents repeating it on every call.
+    """
+    git_dir = Path(project_path) / ".git"
+    if not git_dir.is_dir():
+        return False
+
+    marker = git_dir / COMMIT_GRAPH_MARKER
+    if marker.exists():
+        return False
+
+    try:
+        marker.touch()
+        subprocess.Popen(
+            ['git', 'commit-graph', 'write', '--reachable', '--changed-paths'],
+            cwd=project_path,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+        return True
+    except:
+        return False
+
+
 def validate_date_string(date_str):
     """Validate date string to prevent injection."""
-    import re
-    # Allow ISO dates, relative dates like "7 days ago", or simple formats
-    safe_patterns = [
-        r'^\d{4}-\d{2}-\d{2}$',  # YYYY-MM-DD
-        r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}',  # ISO format
-        r'^\d+\s+(day|week|month|year)s?\s+ago$',  # Relative dates
-        r'^yesterday$',
-        r'^last\s+(week|month|year)$',
-    ]
-    return any(re.match(p, date_str, re.IGNORECASE) for p in safe_patterns)
+    return any(p.match(date_str) for p in _SAFE_DATE_PATTERNS)
 
 
 def get_commits_since(project_path, since_date):
@@ -104,64 +142,129 @@ def get_commits_since(project_path, since_date):
     return commits
 
 
-def get_files_changed_since(project_path, since_date):
-    """Get files changed since a date."""
+def get_changes_since(project_path, since_date, max_count=100):
+    """Get commits and the files they touched since a date in one git call.
+
+    Returns (commits, files). Capped at max_count commits (None for no cap)
+    so huge histories don't blow up the hook.
+    """
     # SECURITY: Validate date to prevent injection
     if not validate_date_string(since_date):
-        return []
+        return [], []
 
-    # Get the commit hash from before the date first
-    rev_output = run_git_command(
-        ['git', 'rev-list', '-1', f'--before={since_date}', 'HEAD'],
-        project_path
-    )
+    # %x1e (record separator) starts each commit header; -z NUL-terminates
+    # file names so paths are neither quoted nor split on newlines.
+    # Subject goes last so a '|' in it can't shift the other fields.
+    args = ['git', 'log', f'--since={since_date}', '--no-merges', '-z',
+            '--name-only', '--pretty=format:%x1e%h|%an|%ai|%s']
+    if max_count:
+        args.insert(3, f'--max-count={int(max_count)}')
 
-    if rev_output:
-        output = run_git_command(
-            ['git', 'diff', '--name-only', rev_output, 'HEAD'],
-            project_path
-        )
-    else:
-        output = None
+    output = run_git_command(args, project_path)
 
     if not output:
-        # Fallback: get files from recent commits
-        output = run_git_command(
-            ['git', 'log', f'--since={since_date}', '--name-only', '--pretty=format:'],
-            project_path
-        )
-        if output:
-            # Remove duplicates
-            output = '\n'.join(sorted(set(output.split('\n'))))
+        return [], []
 
-    if not output:
-        return []
+    commits = []
+    files = []
+    seen_files = set()
+    for record in output.split("\x1e"):
+        if not record:
+            continue
+        header, _, file_block = record.partition("\n")
+        parts = header.rstrip("\0").split("|", 3)
+        if len(parts) >= 4:
+            commits.append({
+                "hash": parts[0],
+                "author": parts[1],
+                "message": parts[3],
+                "date": parts[2]
+            })
+        for f in file_block.split("\0"):
+            f = f.strip()
+            if f and f not in seen_files:
+                seen_files.add(f)
+                files.append(f)
 
-    files = [f.strip() for f in output.split("\n") if f.strip()]
-    return list(set(files))
+    return commits, files
 
 
-def get_current_branch(project_path):
-    """Get current branch name."""
-    return run_git_command("git branch --show-current", project_path)
+def get_changes_since_cached(project_path, since_date):
+    """Uncapped get_changes_since(), reused while HEAD and since_date are unchanged.
 
+    History below a fixed HEAD never changes, so for an absolute since_date
+    the commit/file lists can be stored per project and served from disk
+    after a single `git rev-parse HEAD`. Relative dates ("7 days ago") move
+    with the clock and are never cached.
+    """
+    if not (_SAFE_DATE_PATTERNS[0].match(since_date) or _SAFE_DATE_PATTERNS[1].match(since_date)):
+        return get_changes_since(project_path, since_date, max_count=None)
 
-def get_uncommitted_changes(project_path):
-    """Get summary of uncommitted changes."""
-    status = run_git_command("git status --porcelain", project_path)
+    head = run_git_command(['git', 'rev-parse', 'HEAD'], project_path)
+    if not head:
+        return get_changes_since(project_path, since_date, max_count=None)
+
+    project_key = str(Path(project_path).resolve())
+    cache_file = GIT_CACHE_DIR / f"{hashlib.sha1(project_key.encode()).hexdigest()[:16]}.json"
+    key = [project_key, head, since_date]
+
+    try:
+        cached = json_loads(cache_file.read_bytes())
+        if cached.get("key") == key:
+            return cached["commits"], cached["files"]
+    except:
+        pass
+
+    commits, files = get_changes_since(project_path, since_date, max_count=None)
+
+    try:
+        write_atomic(cache_file, json_dumps({"key": key, "commits": commits, "files": files}))
+    except:
+        pass
 
-    if not status:
-        return {"staged": [], "modified": [], "untracked": []}
+    return commits, files
+
+
+def _parse_branch_header(header):
+    """Branch name from a porcelain '## ...' header (None when detached)."""
+    branch = header[3:]
+    for prefix in ("No commits yet on ", "Initial commit on "):
+        if branch.startswith(prefix):
+            return branch[len(prefix):]
+    if branch.startswith("HEAD (no branch)"):
+        return None
+    return branch.split("...", 1)[0].split(" ", 1)[0] or None
+
+
+def get_status(project_path):
+    """Get current branch and uncommitted changes from one git status call.
+
+    Returns (branch, {"staged": [...], "modified": [...], "untracked": [...]}).
+    """
+    status = run_git_command(
+        ['git', 'status', '--porcelain=v1', '--branch', '-z'],
+        project_path
+    )
 
+    branch = None
     staged = []
     modified = []
     untracked = []
 
-    for line in status.split("\n"):
-        if not line:
+    entries = iter(status.split("\0") if status else [])
+    for entry in entries:
+        if not entry:
+            continue
+        if entry.startswith("## "):
+            branch = _parse_branch_header(entry)
             continue
-        status_code = line[:2]
-        filename = line[3:]
+
+        status_code = entry[:2]
+        filename = entry[3:]
+
+        # Renames/copies are followed by a NUL-separated original path
+        if status_code[0] in "RC":
+            next(entries, None)
 
         if status_code[0] in "MADRC":
             staged.append(filename)
@@ -170,27 +273,41 @@ def get_uncommitted_changes(project_path):
         if status_code == "??":
             untracked.append(filename)
 
-    return {
+    return branch, {
         "staged": staged[:20],
         "modified": modified[:20],
         "untracked": untracked[:10]
     }
 
 
+def get_current_branch(project_path):
+    """Get current branch name."""
+    return get_status(project_path)[0]
+
+
+def get_uncommitted_changes(project_path):
+    """Get summary of uncommitted changes."""
+    return get_status(project_path)[1]
+
+
+# Every indicator contains "claude", which doubles as a cheap pre-check
+CLAUDE_COMMIT_INDICATORS = (
+    "co-authored-by: claude",
+    "generated with claude",
+    "claude code",
+)
+
+
 def identify_claude_commits(commits):
     """Identify which commits were likely made during Claude sessions."""
-    claude_indicators = [
-        "co-authored-by: claude",
-        "generated with claude",
-        "claude code",
-    ]
-
     claude_commits = []
     other_commits = []
 
     for commit in commits:
         msg_lower = commit["message"].lower()
-        is_claude = any(indicator in msg_lower for indicator in claude_indicators)
+        is_claude = "claude" in msg_lower and any(
+            indicator in msg_lower for indicator in CLAUDE_COMMIT_INDICATORS
+        )
 
         if is_claude:
             claude_commits.append(commit)
@@ -207,14 +324,15 @@ def analyze_changes(project_path, since_date=None, project_id=None):
         since_date = get_last_session_time(project_id)
 
     if not since_date:
-        # Default to 7 days ago
-        since_date = (datetime.now(timezone.utc) - timedelta(days=7)).isoformat()
-
-    # Gather git data
-    commits = get_commits_since(project_path, since_date)
-    files = get_files_changed_since(project_path, since_date)
-    branch = get_current_branch(project_path)
-    uncommitted = get_uncommitted_changes(project_path)
+        # Default to 7 days ago (to the hour, so repeat runs can reuse the cache)
+        since_date = (datetime.now(timezone.utc) - timedelta(days=7)).replace(
+            minute=0, second=0, microsecond=0
+        ).isoformat()
+
+    # Gather git data (commits + touched files from a single git log, cached
+    # per HEAD; working-tree status is always read fresh)
+    commits, files = get_changes_since_cached(project_path, since_date)
+    branch, uncommitted = get_status(project_path)
 
     # Separate Claude commits from user commits
     claude_commits, user_commits = identify_claude_commits(commits)
@@ -16,45 +16,163 @@ Usage:
   python outcome_tracker.py --stats --domain "docker"
 """
 
+import functools
 import json
 import subprocess
 import sys
-import os
 from pathlib import Path
 from datetime import datetime, timezone
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from _jsonio import json_dumps, json_loads, write_atomic
 
 MEMORY_ROOT = Path.home() / ".claude-dash"
-OUTCOMES_FILE = MEMORY_ROOT / "learning" / "outcomes.json"
+OUTCOMES_FILE = MEMORY_ROOT / "learning" / "outcomes.json"  # legacy combined file
+OUTCOMES_LOG = MEMORY_ROOT / "learning" / "outcomes.jsonl"
+OUTCOME_STATS_FILE = MEMORY_ROOT / "learning" / "outcome_stats.json"
 
+MAX_OUTCOMES = 500
+# Compact the outcomes log once it grows well past MAX_OUTCOMES entries
+OUTCOMES_COMPACT_BYTES = 256 * 1024
 
-def load_outcomes():
-    """Load outcomes database."""
-    if not OUTCOMES_FILE.exists():
-        return {
-            "outcomes": [],
-            "domain_stats": {},
-            "approach_stats": {}
-        }
+
+def _empty_stats():
+    return {"domain_stats": {}, "approach_stats": {}}
+
+
+def _migrate_legacy_file():
+    """Split the legacy outcomes.json into the stats file + outcomes log."""
+    try:
+        legacy = json_loads(OUTCOMES_FILE.read_bytes())
+    except:
+        return None
+
+    stats = _empty_stats()
+    for key in stats:
+        if key in legacy:
+            stats[key] = legacy[key]
+
+    _write_log(legacy.get("outcomes", [])[-MAX_OUTCOMES:])
+    save_outcome_stats(stats)
+    return stats
+
+
+def load_outcome_stats():
+    """Load domain_stats/approach_stats counters.
+
+    Individual outcomes live in a separate append-only log so recording
+    and stats lookups only touch this small file. See load_outcome_records().
+    """
+    if not OUTCOME_STATS_FILE.exists():
+        if OUTCOMES_FILE.exists():
+            migrated = _migrate_legacy_file()
+            if migrated is not None:
+                return migrated
+        return _empty_stats()
 
     try:
-        return json.loads(OUTCOMES_FILE.read_text())
+        return json_loads(OUTCOME_STATS_FILE.read_bytes())
     except:
-        return {"outcomes": [], "domain_stats": {}, "approach_stats": {}}
+        return _empty_stats()
+
+
+def save_outcome_stats(stats):
+    """Save domain_stats/approach_stats counters."""
+    write_atomic(OUTCOME_STATS_FILE, json_dumps(stats))
+
+
+def _read_log_lines():
+    try:
+        with open(OUTCOMES_LOG, "rb") as f:
+            return [line for line in f if line.strip()]
+    except OSError:
+        return []
+
+
+def _write_log(records):
+    write_atomic(OUTCOMES_LOG, b"".join(json_dumps(r) + b"\n" for r in records))
+
+
+def load_outcome_records(limit=MAX_OUTCOMES):
+    """Load the most recent outcome records from the log."""
+    records = []
+    for line in _read_log_lines()[-limit:]:
+        try:
+            records.append(json_loads(line))
+        except json.JSONDecodeError:
+            continue
+    return records
+
+
+def _iter_recent_records(limit=MAX_OUTCOMES):
+    """Yield the records load_outcome_records() would return, newest first, parsing lazily."""
+    for line in reversed(_read_log_lines()[-limit:]):
+        try:
+            yield json_loads(line)
+        except json.JSONDecodeError:
+            continue
+
+
+def _append_outcome(record):
+    """Append an outcome record, compacting the log when it grows too large."""
+    OUTCOMES_LOG.parent.mkdir(parents=True, exist_ok=True)
+    with open(OUTCOMES_LOG, "ab") as f:
+        f.write(json_dumps(record) + b"\n")
+
+    try:
+        if OUTCOMES_LOG.stat().st_size > OUTCOMES_COMPACT_BYTES:
+            _write_log(load_outcome_records())
+    except OSError:
+        pass
+
+
+def load_outcomes():
+    """Load outcomes database (stats plus the recent outcome records)."""
+    data = load_outcome_stats()
+    data["outcomes"] = load_outcome_records()
+    return data
 
 
 def save_outcomes(data):
-    """Save outcomes database."""
-    OUTCOMES_FILE.parent.mkdir(parents=True, exist_ok=True)
-    OUTCOMES_FILE.write_text(json.dumps(data, indent=2))
+    """Save outcomes database (rewrites the stats file and the outcomes log)."""
+    _write_log(data.get("outcomes", [])[-MAX_OUTCOMES:])
+    save_outcome_stats({k: data.get(k, {}) for k in _empty_stats()})
+
+
+def _mtime_ns(path):
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
 
 
 def detect_project_type(project_path):
-    """Detect project type for appropriate build/test commands."""
+    """Detect project type for appropriate build/test commands.
+
+    Cached per project; the directory's mtime (marker files added/removed)
+    and package.json's mtime (dependency changes) invalidate the entry.
+    """
+    path = Path(project_path).resolve()
+    return _detect_project_type(str(path), _mtime_ns(path), _mtime_ns(path / "package.json"))
+
+
+# Substrings detect_project_type looks for in package.json dependencies
+_FRAMEWORK_MARKERS = (b"expo", b"next", b"react-native")
+
+
+@functools.lru_cache(maxsize=256)
+def _detect_project_type(project_path, dir_mtime, package_json_mtime):
     path = Path(project_path)
 
-    if (path / "package.json").exists():
-        pkg = json.loads((path / "package.json").read_text())
+    if package_json_mtime is not None:
+        raw = (path / "package.json").read_bytes()
+        # Plain node projects mention none of the framework names anywhere,
+        # so they skip the parse (unless \u escapes could hide a name)
+        if b"\\u" not in raw and not any(name in raw for name in _FRAMEWORK_MARKERS):
+            return "node"
+
+        pkg = json_loads(raw)
         scripts = pkg.get("scripts", {})
 
         if "expo" in str(pkg.get("dependencies", {})):
@@ -81,52 +199,54 @@ def detect_project_type(project_path):
     return "unknown"
 
 
-def get_build_commands(project_type):
-    """Get build/test commands for project type."""
-    commands = {
-        "node": {
-            "build": "npm run build",
-            "test": "npm test",
-            "lint": "npm run lint"
-        },
-        "nextjs": {
-            "build": "npm run build",
-            "test": "npm test",
-            "lint": "npm run lint"
-        },
-        "expo": {
-            "build": "npx expo export --platform web",
-            "test": "npm test",
-            "lint": "npm run lint"
-        },
-        "react-native": {
-            "build": "npx react-native bundle --entry-file index.js --platform ios --dev false --bundle-output /tmp/bundle.js",
-            "test": "npm test",
-            "lint": "npm run lint"
-        },
-        "python": {
-            "build": "python -m py_compile *.py",
-            "test": "pytest",
-            "lint": "ruff check ."
-        },
-        "rust": {
-            "build": "cargo build",
-            "test": "cargo test",
-            "lint": "cargo clippy"
-        },
-        "go": {
-            "build": "go build ./...",
-            "test": "go test ./...",
-            "lint": "go vet ./..."
-        },
-        "android": {
-            "build": "./gradlew assembleDebug",
-            "test": "./gradlew test",
-            "lint": "./gradlew lint"
-        }
+# Build/test/lint commands per project type
+BUILD_COMMANDS = {
+    "node": {
+        "build": "npm run build",
+        "test": "npm test",
+        "lint": "npm run lint"
+    },
+    "nextjs": {
+        "build": "npm run build",
+        "test": "npm test",
+        "lint": "npm run lint"
+    },
+    "expo": {
+        "build": "npx expo export --platform web",
+        "test": "npm test",
+        "lint": "npm run lint"
+    },
+    "react-native": {
+        "build": "npx react-native bundle --entry-file index.js --platform ios --dev false --bundle-output /tmp/bundle.js",
+        "test": "npm test",
+        "lint": "npm run lint"
+    },
+    "python": {
+        "build": "python -m py_compile *.py",
+        "test": "pytest",
+        "lint": "ruff check ."
+    },
+    "rust": {
+        "build": "cargo build",
+        "test": "cargo test",
+        "lint": "cargo clippy"
+    },
+    "go": {
+        "build": "go build ./...",
+        "test": "go test ./...",
+        "lint": "go vet ./..."
+    },
+    "android": {
+        "build": "./gradlew assembleDebug",
+        "test": "./gradlew test",
+        "lint": "./gradlew lint"
     }
+}
+
 
-    return commands.get(project_type, {"build": None, "test": None, "lint": None})
+def get_build_commands(project_type):
+    """Get build/test commands for project type."""
+    return BUILD_COMMANDS.get(project_type, {"build": None, "test": None, "lint": None})
 
 
 def run_check(command, project_path, timeout=120):
@@ -183,20 +303,45 @@ def check_build(project_path, checks=None):
 
     overall_success = True
 
-    for check in checks:
-        if check in commands and commands[check]:
-            result = run_check(commands[check], project_path)
-            results["checks"][check] = result
-            if result.get("success") is False:
-                overall_success = False
+    # The checks are independent processes, so run them side by side
+    to_run = [check for check in checks if check in commands and commands[check]]
+    if to_run:
+        with ThreadPoolExecutor(max_workers=len(to_run)) as executor:
+            futures = {check: executor.submit(run_check, commands[check], project_path) for check in to_run}
+            for check, future in futures.items():
+                result = future.result()
+                results["checks"][check] = result
+                if result.get("success") is False:
+                    overall_success = False
 
     results["overall_success"] = overall_success
     return results
 
 
+OUTCOME_KINDS = ("success", "failure", "partial")
+
+
+def _bump_counter(counter, outcome):
+    """Count an outcome and refresh the counter's cached total/success_rate."""
+    if outcome not in OUTCOME_KINDS:
+        return
+    counter[outcome] = counter.get(outcome, 0) + 1
+    total = counter.get("success", 0) + counter.get("failure", 0) + counter.get("partial", 0)
+    counter["total"] = total
+    counter["success_rate"] = counter.get("success", 0) / total
+
+
+def _totals(counter):
+    """(total, success_rate) for a counter, computed only for pre-cache entries."""
+    if "total" in counter:
+        return counter["total"], counter.get("success_rate", 0)
+    total = counter["success"] + counter["failure"] + counter["partial"]
+    return total, counter["success"] / total if total > 0 else 0
+
+
 def record_outcome(approach, outcome, domain=None, context=None, project_id=None, files_changed=None):
     """Record an outcome for learning."""
-    data = load_outcomes()
+    data = load_outcome_stats()
 
     record = {
         "timestamp": datetime.now(timezone.utc).isoformat(),
@@ -208,39 +353,32 @@ def record_outcome(approach, outcome, domain=None, context=None, project_id=None
         "files_changed": files_changed[:10] if files_changed else None
     }
 
-    data["outcomes"].append(record)
-
     # Update domain stats
     if domain:
         if domain not in data["domain_stats"]:
             data["domain_stats"][domain] = {"success": 0, "failure": 0, "partial": 0}
-        if outcome in data["domain_stats"][domain]:
-            data["domain_stats"][domain][outcome] += 1
+        _bump_counter(data["domain_stats"][domain], outcome)
 
     # Update approach stats
     approach_key = approach[:50] if approach else "unknown"
     if approach_key not in data["approach_stats"]:
         data["approach_stats"][approach_key] = {"success": 0, "failure": 0, "partial": 0}
-    if outcome in data["approach_stats"][approach_key]:
-        data["approach_stats"][approach_key][outcome] += 1
-
-    # Keep last 500 outcomes
-    data["outcomes"] = data["outcomes"][-500:]
+    _bump_counter(data["approach_stats"][approach_key], outcome)
 
-    save_outcomes(data)
+    _append_outcome(record)
+    save_outcome_stats(data)
     return record
 
 
 def get_domain_stats(domain=None):
     """Get success statistics for a domain."""
-    data = load_outcomes()
+    data = load_outcome_stats()
     stats = data.get("domain_stats", {})
 
     if domain:
         if domain in stats:
             s = stats[domain]
-            total = s["success"] + s["failure"] + s["partial"]
-            success_rate = s["success"] / total if total > 0 else 0
+            total, success_rate = _totals(s)
             return {
                 "domain": domain,
                 "total": total,
@@ -254,23 +392,20 @@ def get_domain_stats(domain=None):
     # Return all domain stats
     result = {}
     for d, s in stats.items():
-        total = s["success"] + s["failure"] + s["partial"]
+        total, success_rate = _totals(s)
         result[d] = {
             "total": total,
-            "success_rate": s["success"] / total if total > 0 else 0
+            "success_rate": success_rate
         }
     return result
 
 
 def get_approach_history(approach_pattern, limit=5):
     """Get history of similar approaches."""
-    data = load_outcomes()
-    outcomes = data.get("outcomes", [])
-
     pattern_lower = approach_pattern.lower()
     relevant = []
 
-    for outcome in reversed(outcomes):
+    for outcome in _iter_recent_records():
         approach = outcome.get("approach", "").lower()
         if pattern_lower in approach or approach in pattern_lower:
             relevant.append(outcome)
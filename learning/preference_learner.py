@@ -20,19 +20,41 @@ import json
 import subprocess
 import sys
 import re
+import threading
 from pathlib import Path
 from datetime import datetime, timezone
 from collections import defaultdict
 
+from _jsonio import json_dumps, json_loads, write_atomic
+
 MEMORY_ROOT = Path.home() / ".claude-dash"
 PREFERENCES_FILE = MEMORY_ROOT / "learning" / "inferred_preferences.json"
+OBSERVATIONS_LOG = MEMORY_ROOT / "learning" / "preference_observations.jsonl"
+
+MAX_OBSERVATIONS = 300
+# Compact the observations log once it grows well past MAX_OBSERVATIONS entries
+OBSERVATIONS_COMPACT_BYTES = 512 * 1024
+
+# Naming-style patterns for infer_preference()
+_CAMEL_RE = re.compile(r'\b[a-z]+[A-Z][a-zA-Z]*\b')
+_SNAKE_RE = re.compile(r'\b[a-z]+_[a-z_]+\b')
+
+# `function` as a whole word, checked on added diff lines
+_FUNCTION_WORD_RE = re.compile(r"\bfunction\b")
+
+
+def _write_observations(observations):
+    write_atomic(OBSERVATIONS_LOG, b"".join(json_dumps(o) + b"\n" for o in observations))
 
 
 def load_preferences():
-    """Load inferred preferences."""
+    """Load inferred preferences (inferred + confidence).
+
+    Raw observations live in a separate append-only log so recording one
+    doesn't rewrite them all. See load_observations().
+    """
     if not PREFERENCES_FILE.exists():
         return {
-            "observations": [],
             "inferred": {
                 "naming": {},
                 "syntax": {},
@@ -43,21 +65,60 @@ def load_preferences():
         }
 
     try:
-        return json.loads(PREFERENCES_FILE.read_text())
+        data = json_loads(PREFERENCES_FILE.read_bytes())
     except:
-        return {"observations": [], "inferred": {}, "confidence": {}}
+        return {"inferred": {}, "confidence": {}}
+
+    # Legacy files kept observations inline; move them to the log once
+    if "observations" in data:
+        _write_observations(data.pop("observations")[-MAX_OBSERVATIONS:])
+        save_preferences(data)
+
+    return data
 
 
 def save_preferences(data):
     """Save preferences."""
-    PREFERENCES_FILE.parent.mkdir(parents=True, exist_ok=True)
-    PREFERENCES_FILE.write_text(json.dumps(data, indent=2))
+    write_atomic(PREFERENCES_FILE, json_dumps(data))
+
+
+def load_observations(limit=MAX_OBSERVATIONS):
+    """Load the most recent observations from the log."""
+    if not OBSERVATIONS_LOG.exists():
+        return []
+
+    observations = []
+    try:
+        with open(OBSERVATIONS_LOG, "rb") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    observations.append(json_loads(line))
+                except json.JSONDecodeError:
+                    continue
+    except OSError:
+        return []
+
+    return observations[-limit:]
+
+
+def _append_observation(observation):
+    """Append an observation, compacting the log when it grows too large."""
+    OBSERVATIONS_LOG.parent.mkdir(parents=True, exist_ok=True)
+    with open(OBSERVATIONS_LOG, "ab") as f:
+        f.write(json_dumps(observation) + b"\n")
+
+    try:
+        if OBSERVATIONS_LOG.stat().st_size > OBSERVATIONS_COMPACT_BYTES:
+            _write_observations(load_observations())
+    except OSError:
+        pass
 
 
 def record_observation(original, modified, category=None, file_type=None, context=None):
     """Record when user modifies Claude's output."""
-    data = load_preferences()
-
     observation = {
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "original": original[:200],
@@ -67,18 +128,15 @@ def record_observation(original, modified, category=None, file_type=None, contex
         "context": context[:100] if context else None
     }
 
-    # Try to infer the preference
+    # Try to infer the preference; the preferences file only changes then
     inference = infer_preference(original, modified)
     if inference:
         observation["inference"] = inference
+        data = load_preferences()
         update_inferred_preferences(data, inference)
+        save_preferences(data)
 
-    data["observations"].append(observation)
-
-    # Keep last 300 observations
-    data["observations"] = data["observations"][-300:]
-
-    save_preferences(data)
+    _append_observation(observation)
     return observation
 
 
@@ -123,14 +181,9 @@ def infer_preference(original, modified):
     if "/*" in orig and "/*" not in mod:
         inferences.append({"category": "style", "key": "block_comments", "prefers": "minimal", "over": "verbose"})
 
-    # Naming: camelCase vs snake_case
-    camel_pattern = r'\b[a-z]+[A-Z][a-zA-Z]*\b'
-    snake_pattern = r'\b[a-z]+_[a-z_]+\b'
-
-    orig_camels = re.findall(camel_pattern, orig)
-    mod_snakes = re.findall(snake_pattern, mod)
-
-    if orig_camels and mod_snakes:
+    # Naming: camelCase vs snake_case (only a match is needed, and snake_case
+    # can't occur without an underscore, so most edits skip both regexes)
+    if "_" in mod and _SNAKE_RE.search(mod) and _CAMEL_RE.search(orig):
         inferences.append({"category": "naming", "key": "case_style", "prefers": "snake_case", "over": "camelCase"})
 
     # Explicit types vs inference
@@ -183,20 +236,36 @@ def update_inferred_preferences(data, inferences):
         if not pref_data.get("first_observed"):
             pref_data["first_observed"] = datetime.now(timezone.utc).isoformat()
 
-        if prefers not in pref_data["counts"]:
-            pref_data["counts"][prefers] = 0
-        pref_data["counts"][prefers] += 1
+        counts = pref_data["counts"]
+        # Running total and leader; entries saved before these were tracked
+        # get them computed once here
+        if "total" not in pref_data:
+            pref_data["total"] = sum(counts.values())
+        if counts and pref_data.get("max_pref") not in counts:
+            pref_data["max_pref"] = max(counts, key=counts.get)
+
+        counts[prefers] = counts.get(prefers, 0) + 1
+        pref_data["total"] += 1
+
+        # Only `prefers` changed, so it is the only key that can take the lead.
+        # Ties go to the key counted first, as max() over the dict would pick.
+        leader = pref_data.get("max_pref")
+        if leader is None or counts[prefers] > counts[leader] or (
+            counts[prefers] == counts[leader]
+            and next(k for k in counts if k in (prefers, leader)) == prefers
+        ):
+            pref_data["max_pref"] = prefers
 
         # Calculate importance (EWC-style)
         # Higher importance = more observations = harder to change
-        total_observations = sum(pref_data["counts"].values())
+        total_observations = pref_data["total"]
         pref_data["importance"] = min(1.0, total_observations / 20)  # Max out at 20 observations
 
         # Update preferred based on counts with EWC protection
-        if pref_data["counts"]:
-            max_pref = max(pref_data["counts"], key=pref_data["counts"].get)
-            max_count = pref_data["counts"][max_pref]
-            total = sum(pref_data["counts"].values())
+        if counts:
+            max_pref = pref_data["max_pref"]
+            max_count = counts[max_pref]
+            total = pref_data["total"]
 
             # EWC: Require higher threshold to CHANGE an established preference
             current_preferred = pref_data.get("preferred")
@@ -226,6 +295,38 @@ def update_inferred_preferences(data, inferences):
                 data["confidence"][conf_key] = max_count / total
 
 
+def _count_added_line_styles(lines):
+    """Count style markers on the added ("+") lines of a diff in one pass."""
+    counts = dict.fromkeys(
+        ("single_quotes", "double_quotes", "with_semi", "without_semi", "arrows", "functions"), 0
+    )
+
+    for line in lines:
+        if not line.startswith("+") or line.startswith("+++"):
+            continue
+        code = line[1:]
+        if not code:
+            continue
+
+        # A quoted string needs an opening and a closing quote
+        if code.count("'") >= 2:
+            counts["single_quotes"] += 1
+        if code.count('"') >= 2:
+            counts["double_quotes"] += 1
+
+        if code.rstrip().endswith(";"):
+            counts["with_semi"] += 1
+        if code[-1] not in ";{":
+            counts["without_semi"] += 1
+
+        if "=>" in code:
+            counts["arrows"] += 1
+        if "function" in code and _FUNCTION_WORD_RE.search(code):
+            counts["functions"] += 1
+
+    return counts
+
+
 def analyze_git_diffs(project_path, limit=50):
     """Analyze recent git diffs to find user edits to Claude-generated code."""
     # This is a simplified version - would need access to Claude's change history
@@ -234,30 +335,40 @@ def analyze_git_diffs(project_path, limit=50):
     # For now, look for patterns in recent commits
     # SECURITY: Use array form to prevent shell injection
     try:
-        result = subprocess.run(
+        # -U0 drops unchanged context lines: only "+" lines are counted, so
+        # there is no point piping them through. Output is consumed as a
+        # stream so large histories never sit in memory as one string.
+        proc = subprocess.Popen(
             [
-                'git', 'log', '-p', f'-{limit}',
+                'git', '--no-pager', 'log', '-p', '-U0', '--no-color', f'-{limit}',
                 '--pretty=format:COMMIT:%h',
                 '--', '*.ts', '*.tsx', '*.js', '*.jsx'
             ],
             cwd=project_path,
-            capture_output=True,
-            text=True,
-            timeout=60
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True
         )
 
-        if result.returncode != 0:
+        timer = threading.Timer(60, proc.kill)
+        timer.start()
+        try:
+            # Look for consistent patterns (one pass over the added lines)
+            counts = _count_added_line_styles(line.rstrip("\n") for line in proc.stdout)
+            proc.wait()
+        finally:
+            timer.cancel()
+            proc.stdout.close()
+
+        if proc.returncode != 0:
             return []
 
         # Parse diffs for style patterns
         patterns_found = defaultdict(int)
 
-        # Look for consistent patterns
-        content = result.stdout
-
         # Quote style
-        single_quotes = len(re.findall(r"^\+.*'[^']*'", content, re.MULTILINE))
-        double_quotes = len(re.findall(r'^\+.*"[^"]*"', content, re.MULTILINE))
+        single_quotes = counts["single_quotes"]
+        double_quotes = counts["double_quotes"]
 
         if single_quotes > double_quotes * 1.5:
             patterns_found["quotes:single"] = single_quotes
@@ -265,8 +376,8 @@ def analyze_git_diffs(project_path, limit=50):
             patterns_found["quotes:double"] = double_quotes
 
         # Semicolons
-        with_semi = len(re.findall(r"^\+.*;\s*$", content, re.MULTILINE))
-        without_semi = len(re.findall(r"^\+.*[^;{]\s*$", content, re.MULTILINE))
+        with_semi = counts["with_semi"]
+        without_semi = counts["without_semi"]
 
         if with_semi > without_semi * 2:
             patterns_found["semicolons:yes"] = with_semi
@@ -274,8 +385,8 @@ def analyze_git_diffs(project_path, limit=50):
             patterns_found["semicolons:no"] = without_semi
 
         # Arrow functions vs function keyword
-        arrows = len(re.findall(r"^\+.*=>", content, re.MULTILINE))
-        functions = len(re.findall(r"^\+.*\bfunction\b", content, re.MULTILINE))
+        arrows = counts["arrows"]
+        functions = counts["functions"]
 
         if arrows > functions * 2:
             patterns_found["functions:arrow"] = arrows
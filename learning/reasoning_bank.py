@@ -11,8 +11,10 @@ Implements the RETRIEVE→JUDGE→DISTILL→CONSOLIDATE cycle from claude-flow:
 This makes learning more systematic than just storing corrections.
 """
 
+import contextlib
+import fcntl
+import functools
 import json
-import re
 import sys
 from pathlib import Path
 from datetime import datetime, timezone
@@ -20,69 +22,186 @@ from typing import List, Dict, Optional
 from collections import defaultdict
 import hashlib
 
+from _text import extract_key_terms, compute_similarity, jaccard, build_term_index
+from _jsonio import json_dumps, json_loads, write_atomic, read_log, fold_log, file_signature
+
 MEMORY_ROOT = Path.home() / ".claude-dash"
 LEARNING_DIR = MEMORY_ROOT / "learning"
 REASONING_BANK_FILE = LEARNING_DIR / "reasoning_bank.json"
+# New trajectories are appended here and folded into REASONING_BANK_FILE on save
+REASONING_BANK_LOG = LEARNING_DIR / "trajectories.jsonl"
+# Held while the log is appended to or folded into the bank, so no append is lost
+REASONING_BANK_LOCK = LEARNING_DIR / "reasoning_bank.lock"
+
+# Per-trajectory term sets, reused across processes while the bank files are unchanged
+TERM_INDEX_FILE = LEARNING_DIR / "reasoning_bank.idx.json"
+
+MAX_TRAJECTORIES = 500
+# Compact the trajectory log once it grows well past a typical bank's size
+TRAJECTORY_LOG_COMPACT_BYTES = 256 * 1024
+
+
+@contextlib.contextmanager
+def reasoning_bank_lock():
+    """Exclusive lock for a load/save of the bank; appends wait until it is released."""
+    LEARNING_DIR.mkdir(parents=True, exist_ok=True)
+    with open(REASONING_BANK_LOCK, "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
 
 
 def load_reasoning_bank() -> Dict:
-    """Load the reasoning bank."""
+    """Load the reasoning bank, including trajectories appended since the last save."""
     if not REASONING_BANK_FILE.exists():
-        return {
+        bank = {
             "trajectories": [],
             "patterns": {},
             "confidence_scores": {},
             "last_consolidation": None
         }
-    try:
-        return json.loads(REASONING_BANK_FILE.read_text())
-    except:
-        return {"trajectories": [], "patterns": {}, "confidence_scores": {}}
+    else:
+        try:
+            bank = json_loads(REASONING_BANK_FILE.read_bytes())
+        except:
+            bank = {"trajectories": [], "patterns": {}, "confidence_scores": {}}
 
+    logged = read_log(REASONING_BANK_LOG)
+    if logged:
+        bank["trajectories"] = fold_log(bank.get("trajectories", []), logged)[-MAX_TRAJECTORIES:]
+    return bank
 
-def save_reasoning_bank(data: Dict):
-    """Save the reasoning bank."""
-    LEARNING_DIR.mkdir(parents=True, exist_ok=True)
-    REASONING_BANK_FILE.write_text(json.dumps(data, indent=2))
 
+def save_reasoning_bank(data: Dict):
+    """Save the reasoning bank; its trajectories supersede the append log.
 
-def extract_key_terms(text: str) -> set:
-    """Extract key terms from text for matching."""
-    stopwords = {'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been',
-                 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
-                 'would', 'could', 'should', 'may', 'might', 'must', 'shall',
-                 'can', 'need', 'to', 'of', 'in', 'for', 'on', 'with', 'at',
-                 'by', 'from', 'as', 'into', 'that', 'this', 'it', 'its',
-                 'and', 'but', 'or', 'not', 'no', 'yes', 'i', 'you', 'we'}
-    words = re.findall(r'\b[a-zA-Z]{3,}\b', text.lower())
-    return {w for w in words if w not in stopwords}
+    Callers hold reasoning_bank_lock() from the load this data came from,
+    otherwise trajectories appended in between are dropped with the log.
+    """
+    write_atomic(REASONING_BANK_FILE, json_dumps(data))
+    try:
+        REASONING_BANK_LOG.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _append_trajectory(trajectory: Dict):
+    """Append a trajectory to the log, compacting it into the bank when it grows too large."""
+    with reasoning_bank_lock():
+        with open(REASONING_BANK_LOG, "ab") as f:
+            f.write(json_dumps(trajectory) + b"\n")
+
+        try:
+            if REASONING_BANK_LOG.stat().st_size > TRAJECTORY_LOG_COMPACT_BYTES:
+                save_reasoning_bank(load_reasoning_bank())
+        except OSError:
+            pass
+
+
+def _similar_pairs(term_sets: List[frozenset], threshold: float) -> Dict[int, set]:
+    """Map each position to the positions whose Jaccard similarity exceeds threshold.
+
+    Intersection sizes are accumulated from the term postings (a sparse
+    term-document product), so pairs sharing no term are never visited.
+    When a few very common terms make the postings denser than the full
+    pair matrix, pairs are compared directly instead.
+    """
+    postings = defaultdict(list)
+    for i, terms in enumerate(term_sets):
+        for term in terms:
+            postings[term].append(i)
+
+    n = len(term_sets)
+    intersections = defaultdict(int)
+    if sum(len(p) * (len(p) - 1) for p in postings.values()) <= n * (n - 1):
+        for positions in postings.values():
+            for k, i in enumerate(positions):
+                for j in positions[k + 1:]:
+                    intersections[i, j] += 1
+    else:
+        for i, terms in enumerate(term_sets):
+            for j in range(i + 1, n):
+                intersection = len(terms & term_sets[j])
+                if intersection:
+                    intersections[i, j] = intersection
+
+    neighbours = defaultdict(set)
+    for (i, j), intersection in intersections.items():
+        if intersection / (len(term_sets[i]) + len(term_sets[j]) - intersection) > threshold:
+            neighbours[i].add(j)
+            neighbours[j].add(i)
+    return neighbours
+
+
+def _load_term_sets(signature: tuple, count: int) -> Optional[List[frozenset]]:
+    """Term sets persisted for this on-disk state of the bank, or None if stale."""
+    try:
+        cached = json_loads(TERM_INDEX_FILE.read_bytes())
+    except:
+        return None
+    if cached.get("signature") != [list(part) if part else None for part in signature]:
+        return None
+    if len(cached.get("terms", ())) != count:
+        return None
+    return [frozenset(terms) for terms in cached["terms"]]
 
 
-def compute_similarity(text1: str, text2: str) -> float:
-    """Compute Jaccard similarity between two texts."""
-    terms1 = extract_key_terms(text1)
-    terms2 = extract_key_terms(text2)
-    if not terms1 or not terms2:
-        return 0.0
-    intersection = len(terms1 & terms2)
-    union = len(terms1 | terms2)
-    return intersection / union if union > 0 else 0.0
+def _save_term_sets(signature: tuple, term_sets: List[frozenset]):
+    """Persist term sets keyed by the bank's on-disk state (best effort)."""
+    try:
+        write_atomic(TERM_INDEX_FILE, json_dumps({
+            "signature": [list(part) if part else None for part in signature],
+            "terms": [sorted(terms) for terms in term_sets],
+        }))
+    except OSError:
+        pass
+
+
+@functools.lru_cache(maxsize=1)
+def _trajectory_index(signature: tuple):
+    """Trajectories with their term sets and inverted index, cached per on-disk state.
+
+    The returned trajectories are shared between calls and must not be mutated.
+    """
+    trajectories = load_reasoning_bank().get("trajectories", [])
+    term_sets = _load_term_sets(signature, len(trajectories))
+    if term_sets is None:
+        term_sets = [
+            extract_key_terms(traj.get("context", "") + " " + traj.get("problem", ""))
+            for traj in trajectories
+        ]
+        # Skip persisting if the files changed while they were being read
+        if signature == (file_signature(REASONING_BANK_FILE), file_signature(REASONING_BANK_LOG)):
+            _save_term_sets(signature, term_sets)
+    return trajectories, term_sets, build_term_index(term_sets)
 
 
 # RETRIEVE: Find similar past situations
 def retrieve_similar(context: str, domain: str = None, limit: int = 5) -> List[Dict]:
     """Find similar past learning trajectories."""
-    bank = load_reasoning_bank()
-    trajectories = bank.get("trajectories", [])
+    trajectories, term_sets, index = _trajectory_index(
+        (file_signature(REASONING_BANK_FILE), file_signature(REASONING_BANK_LOG))
+    )
     if not trajectories:
         return []
 
+    query_terms = extract_key_terms(context)
+    if not query_terms:
+        return []
+
+    # Only trajectories sharing a term with the query can clear the threshold
+    candidates = set()
+    for term in query_terms:
+        candidates.update(index.get(term, ()))
+
     scored = []
-    for traj in trajectories:
+    for i in sorted(candidates):
+        traj = trajectories[i]
         if domain and traj.get("domain") != domain:
             continue
-        traj_context = traj.get("context", "") + " " + traj.get("problem", "")
-        similarity = compute_similarity(context, traj_context)
+        similarity = jaccard(query_terms, term_sets[i])
         if similarity > 0.1:
             scored.append({"trajectory": traj, "similarity": similarity})
 
@@ -114,6 +233,19 @@ def judge_applicability(past_trajectory: Dict, current_context: str,
     }
 
 
+def _common_terms(term_sets: List[frozenset]) -> frozenset:
+    """Terms shared by every set, intersecting smallest first and stopping once empty."""
+    if not term_sets:
+        return frozenset()
+    ordered = sorted(term_sets, key=len)
+    common = ordered[0]
+    for terms in ordered[1:]:
+        if not common:
+            break
+        common = common & terms
+    return common
+
+
 # DISTILL: Extract generalizable patterns
 def distill_pattern(trajectories: List[Dict]) -> Optional[Dict]:
     """Extract a generalizable pattern from multiple trajectories."""
@@ -128,18 +260,19 @@ def distill_pattern(trajectories: List[Dict]) -> Optional[Dict]:
             terms = extract_key_terms(t.get("problem", ""))
         all_trigger_terms.append(terms)
 
-    common_context = set.intersection(*all_trigger_terms) if all_trigger_terms and all(all_trigger_terms) else set()
-
-    all_solution_terms = [extract_key_terms(t.get("solution", "")) for t in trajectories]
-    common_solution = set.intersection(*all_solution_terms) if all_solution_terms and all(all_solution_terms) else set()
+    common_context = _common_terms(all_trigger_terms)
+    if not common_context:
+        return None
 
-    if not common_context or not common_solution:
+    common_solution = _common_terms([extract_key_terms(t.get("solution", "")) for t in trajectories])
+    if not common_solution:
         return None
 
     domains = [t.get("domain") for t in trajectories if t.get("domain")]
     common_domain = domains[0] if domains and all(d == domains[0] for d in domains) else None
 
     pattern_key = f"{common_domain or 'general'}_{'-'.join(sorted(common_context)[:3])}"
+    # Kept on md5 so ids stay stable and consolidation keeps updating stored patterns
     pattern_id = hashlib.md5(pattern_key.encode()).hexdigest()[:12]
 
     return {
@@ -157,7 +290,12 @@ def distill_pattern(trajectories: List[Dict]) -> Optional[Dict]:
 # CONSOLIDATE: Update long-term memory
 def consolidate_learning(force: bool = False) -> Dict:
     """Merge patterns and update long-term memory."""
-    bank = load_reasoning_bank()
+    with reasoning_bank_lock():
+        return _consolidate(load_reasoning_bank())
+
+
+def _consolidate(bank: Dict) -> Dict:
+    """Distill patterns from a loaded bank and save it (under reasoning_bank_lock)."""
     trajectories = bank.get("trajectories", [])
     stats = {"trajectories_processed": len(trajectories), "patterns_created": 0, "patterns_updated": 0}
 
@@ -172,6 +310,12 @@ def consolidate_learning(force: bool = False) -> Dict:
         if len(domain_trajs) < 2:
             continue
 
+        # Use context for similarity, fallback to problem text when context is empty
+        neighbours = _similar_pairs(
+            [extract_key_terms(t.get("context", "") or t.get("problem", "")) for t in domain_trajs],
+            0.3,  # Lowered threshold
+        )
+
         clusters = []
         used = set()
         for i, traj in enumerate(domain_trajs):
@@ -179,15 +323,11 @@ def consolidate_learning(force: bool = False) -> Dict:
                 continue
             cluster = [traj]
             used.add(i)
-            for j, other in enumerate(domain_trajs):
+            for j in sorted(neighbours.get(i, ())):
                 if j in used:
                     continue
-                # Use context for similarity, fallback to problem text when context is empty
-                traj_text = traj.get("context", "") or traj.get("problem", "")
-                other_text = other.get("context", "") or other.get("problem", "")
-                if compute_similarity(traj_text, other_text) > 0.3:  # Lowered threshold
-                    cluster.append(other)
-                    used.add(j)
+                cluster.append(domain_trajs[j])
+                used.add(j)
             if len(cluster) >= 2:
                 clusters.append(cluster)
 
@@ -210,8 +350,7 @@ def consolidate_learning(force: bool = False) -> Dict:
 def record_trajectory(context: str, problem: str, solution: str,
                      domain: str = None, project_id: str = None) -> Dict:
     """Record a learning trajectory."""
-    bank = load_reasoning_bank()
-    traj_id = hashlib.md5(f"{context[:100]}_{datetime.now().isoformat()}".encode()).hexdigest()[:12]
+    traj_id = hashlib.blake2b(f"{context[:100]}_{datetime.now().isoformat()}".encode(), digest_size=6).hexdigest()
 
     trajectory = {
         "id": traj_id,
@@ -223,11 +362,7 @@ def record_trajectory(context: str, problem: str, solution: str,
         "created_at": datetime.now(timezone.utc).isoformat()
     }
 
-    bank.setdefault("trajectories", []).append(trajectory)
-    if len(bank["trajectories"]) > 500:
-        bank["trajectories"] = bank["trajectories"][-500:]
-
-    save_reasoning_bank(bank)
+    _append_trajectory(trajectory)
     return trajectory
 
 
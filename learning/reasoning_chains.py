@@ -11,8 +11,11 @@ Usage:
     python reasoning_chains.py stats
 """
 
+import contextlib
+import fcntl
+import functools
+import heapq
 import json
-import re
 import sys
 from pathlib import Path
 from datetime import datetime, timezone
@@ -20,76 +23,149 @@ from typing import List, Dict, Optional
 import hashlib
 import argparse
 
+from _text import extract_key_terms, compute_similarity, jaccard, build_term_index
+from _jsonio import json_dumps, json_loads, write_atomic, read_log, fold_log, file_signature
+
 MEMORY_ROOT = Path.home() / ".claude-dash"
 LEARNING_DIR = MEMORY_ROOT / "learning"
 CHAINS_FILE = LEARNING_DIR / "reasoning_chains.json"
+# New chains are appended here and folded into CHAINS_FILE on save
+CHAINS_LOG = LEARNING_DIR / "reasoning_chains.jsonl"
+
+MAX_CHAINS = 500
+MAX_PROJECT_CHAINS = 200
+# Compact a chains log once it grows well past a typical chains file's size
+CHAINS_LOG_COMPACT_BYTES = 256 * 1024
+
+
+@contextlib.contextmanager
+def _chain_file_lock(path: Path):
+    """Exclusive lock on a chains file's sibling .lock, held across append/load/save."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_suffix(".lock"), "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _load_chain_file(path: Path, log_path: Path, limit: int) -> Dict:
+    """Load a chains file plus any chains appended to its log since the last save."""
+    data = None
+    if path.exists():
+        try:
+            data = json_loads(path.read_bytes())
+        except Exception:
+            pass
+    if data is None:
+        data = {"version": "1.0", "chains": [], "lastUpdated": None}
+
+    logged = read_log(log_path)
+    if logged:
+        data["chains"] = fold_log(data.get("chains", []), logged)[-limit:]
+        data["lastUpdated"] = logged[-1].get("timestamp")
+    return data
+
+
+def _save_chain_file(path: Path, log_path: Path, data: Dict):
+    """Rewrite a chains file; its chains supersede the append log.
+
+    Callers hold _chain_file_lock(path) from the load this data came from,
+    otherwise chains appended in between are dropped with the log.
+    """
+    data["lastUpdated"] = datetime.now(timezone.utc).isoformat()
+    write_atomic(path, json_dumps(data))
+    try:
+        log_path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _append_chain(path: Path, log_path: Path, chain: Dict, limit: int):
+    """Append a chain to a log, compacting it into its chains file when it grows too large."""
+    with _chain_file_lock(path):
+        with open(log_path, "ab") as f:
+            f.write(json_dumps(chain) + b"\n")
+
+        try:
+            if log_path.stat().st_size > CHAINS_LOG_COMPACT_BYTES:
+                _save_chain_file(path, log_path, _load_chain_file(path, log_path, limit))
+        except OSError:
+            pass
+
+
+def _project_chain_paths(project_id: str):
+    """(chains file, append log) for a project."""
+    project_dir = MEMORY_ROOT / "projects" / project_id
+    return project_dir / "reasoning_chains.json", project_dir / "reasoning_chains.jsonl"
 
 
 def load_chains() -> Dict:
     """Load reasoning chains from disk."""
-    if not CHAINS_FILE.exists():
-        return {
-            "version": "1.0",
-            "chains": [],
-            "lastUpdated": None
-        }
-    try:
-        return json.loads(CHAINS_FILE.read_text())
-    except Exception:
-        return {"version": "1.0", "chains": [], "lastUpdated": None}
+    return _load_chain_file(CHAINS_FILE, CHAINS_LOG, MAX_CHAINS)
 
 
 def save_chains(data: Dict):
-    """Save reasoning chains to disk."""
-    LEARNING_DIR.mkdir(parents=True, exist_ok=True)
-    data["lastUpdated"] = datetime.now(timezone.utc).isoformat()
-    CHAINS_FILE.write_text(json.dumps(data, indent=2))
+    """Save reasoning chains to disk (hold _chain_file_lock(CHAINS_FILE) across the load)."""
+    _save_chain_file(CHAINS_FILE, CHAINS_LOG, data)
 
 
 def save_project_chain(project_id: str, chain: Dict):
-    """Save chain to project-specific file."""
-    project_dir = MEMORY_ROOT / "projects" / project_id
-    project_file = project_dir / "reasoning_chains.json"
+    """Save chain to project-specific file (last MAX_PROJECT_CHAINS kept)."""
+    project_file, project_log = _project_chain_paths(project_id)
+    _append_chain(project_file, project_log, chain, MAX_PROJECT_CHAINS)
 
-    if project_file.exists():
-        try:
-            data = json.loads(project_file.read_text())
-        except Exception:
-            data = {"version": "1.0", "chains": []}
-    else:
-        project_dir.mkdir(parents=True, exist_ok=True)
-        data = {"version": "1.0", "chains": []}
 
-    data["chains"].append(chain)
-    # Keep last 200 per project
-    if len(data["chains"]) > 200:
-        data["chains"] = data["chains"][-200:]
+def _chain_terms(chain: Dict) -> tuple:
+    """(trigger, conclusion, steps) term sets; steps use observation + interpretation text."""
+    return (
+        extract_key_terms(chain.get("trigger", "")),
+        extract_key_terms(chain.get("conclusion", "")),
+        extract_key_terms(" ".join(
+            f"{s.get('observation', '')} {s.get('interpretation', '')}"
+            for s in chain.get("steps", [])
+        )),
+    )
 
-    data["lastUpdated"] = datetime.now(timezone.utc).isoformat()
-    project_file.write_text(json.dumps(data, indent=2))
 
+def _build_chain_index(chain_terms: List[tuple]):
+    """Split per-chain term sets by field and build a term -> positions index."""
+    trigger_sets = [trigger for trigger, _, _ in chain_terms]
+    conclusion_sets = [conclusion for _, conclusion, _ in chain_terms]
+    steps_sets = [steps for _, _, steps in chain_terms]
+    index = build_term_index([t | c | s for t, c, s in chain_terms])
+    return trigger_sets, conclusion_sets, steps_sets, index
 
-def extract_key_terms(text: str) -> set:
-    """Extract key terms from text for matching."""
-    stopwords = {'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been',
-                 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will',
-                 'would', 'could', 'should', 'may', 'might', 'must', 'shall',
-                 'can', 'need', 'to', 'of', 'in', 'for', 'on', 'with', 'at',
-                 'by', 'from', 'as', 'into', 'that', 'this', 'it', 'its',
-                 'and', 'but', 'or', 'not', 'no', 'yes', 'i', 'you', 'we'}
-    words = re.findall(r'\b[a-zA-Z]{3,}\b', text.lower())
-    return {w for w in words if w not in stopwords}
 
+def _chains_with_terms(path: Path, log_path: Path, limit: int):
+    """Chains from a chains file and its log, with their term sets.
 
-def compute_similarity(text1: str, text2: str) -> float:
-    """Compute Jaccard similarity between two texts."""
-    terms1 = extract_key_terms(text1)
-    terms2 = extract_key_terms(text2)
-    if not terms1 or not terms2:
-        return 0.0
-    intersection = len(terms1 & terms2)
-    union = len(terms1 | terms2)
-    return intersection / union if union > 0 else 0.0
+    Term sets are persisted to a sibling .idx.json sidecar keyed by the files'
+    (mtime_ns, size), so a new process only re-tokenizes after a write.
+    """
+    signature = [list(part) if part else None for part in map(file_signature, (path, log_path))]
+    chains = _load_chain_file(path, log_path, limit).get("chains", [])
+    sidecar = path.with_suffix(".idx.json")
+
+    try:
+        cached = json_loads(sidecar.read_bytes())
+        if cached.get("signature") == signature and len(cached.get("terms", ())) == len(chains):
+            return chains, [tuple(frozenset(f) for f in fields) for fields in cached["terms"]]
+    except Exception:
+        pass
+
+    chain_terms = [_chain_terms(chain) for chain in chains]
+    # Skip persisting if the files changed while they were being read
+    if signature == [list(part) if part else None for part in map(file_signature, (path, log_path))]:
+        try:
+            write_atomic(sidecar, json_dumps({
+                "signature": signature,
+                "terms": [[sorted(f) for f in fields] for fields in chain_terms],
+            }))
+        except OSError:
+            pass
+    return chains, chain_terms
 
 
 def capture_chain(chain_data: dict) -> dict:
@@ -110,12 +186,10 @@ def capture_chain(chain_data: dict) -> dict:
           - revisitWhen: (optional) List of strings
           - confidence: (optional) 0-1
     """
-    chains = load_chains()
-
     # Generate unique ID
-    chain_id = hashlib.md5(
-        f"{chain_data['trigger']}_{datetime.now(timezone.utc).isoformat()}".encode()
-    ).hexdigest()[:12]
+    chain_id = hashlib.blake2b(
+        f"{chain_data['trigger']}_{datetime.now(timezone.utc).isoformat()}".encode(), digest_size=6
+    ).hexdigest()
 
     # Build chain record
     chain = {
@@ -135,13 +209,7 @@ def capture_chain(chain_data: dict) -> dict:
         "validated": False
     }
 
-    chains["chains"].append(chain)
-
-    # Keep last 500 chains globally
-    if len(chains["chains"]) > 500:
-        chains["chains"] = chains["chains"][-500:]
-
-    save_chains(chains)
+    _append_chain(CHAINS_FILE, CHAINS_LOG, chain, MAX_CHAINS)
 
     # Also save to project-specific file if project specified
     if chain_data.get("project"):
@@ -150,28 +218,39 @@ def capture_chain(chain_data: dict) -> dict:
     return {"captured": True, "id": chain_id}
 
 
+@functools.lru_cache(maxsize=8)
+def _recall_index(project: Optional[str], signature: tuple):
+    """Chains visible to recall_chains plus their term index, cached per on-disk state.
+
+    The returned chains are shared between calls and must not be mutated.
+    """
+    all_chains, all_terms = _chains_with_terms(CHAINS_FILE, CHAINS_LOG, MAX_CHAINS)
+
+    # Also load project-specific chains if project specified
+    if project:
+        project_chains, project_terms = _chains_with_terms(*_project_chain_paths(project), MAX_PROJECT_CHAINS)
+        try:
+            # Deduplicate by ID
+            existing_ids = {c["id"] for c in all_chains}
+            for c, terms in zip(project_chains, project_terms):
+                if c["id"] not in existing_ids:
+                    all_chains.append(c)
+                    all_terms.append(terms)
+        except Exception:
+            pass
+
+    return (all_chains,) + _build_chain_index(all_terms)
+
+
 def recall_chains(context: str, domain: str = None, project: str = None, limit: int = 5) -> List[Dict]:
     """
     Find relevant past reasoning chains.
 
     Uses term overlap scoring with bonuses for domain/project match.
     """
-    chains = load_chains()
-
-    # Also load project-specific chains if project specified
-    all_chains = chains.get("chains", [])
-    if project:
-        project_file = MEMORY_ROOT / "projects" / project / "reasoning_chains.json"
-        if project_file.exists():
-            try:
-                project_data = json.loads(project_file.read_text())
-                # Deduplicate by ID
-                existing_ids = {c["id"] for c in all_chains}
-                for c in project_data.get("chains", []):
-                    if c["id"] not in existing_ids:
-                        all_chains.append(c)
-            except Exception:
-                pass
+    paths = (CHAINS_FILE, CHAINS_LOG) + (_project_chain_paths(project) if project else ())
+    signature = tuple(file_signature(path) for path in paths)
+    all_chains, trigger_sets, conclusion_sets, steps_sets, index = _recall_index(project, signature)
 
     if not all_chains:
         return []
@@ -180,7 +259,19 @@ def recall_chains(context: str, domain: str = None, project: str = None, limit:
     scored = []
     context_terms = extract_key_terms(context)
 
-    for chain in all_chains:
+    # Without term overlap only the domain/project bonuses can clear the threshold
+    candidates = set()
+    for term in context_terms:
+        candidates.update(index.get(term, ()))
+    if domain or project:
+        candidates.update(
+            i for i, chain in enumerate(all_chains)
+            if (domain and chain.get("domain") == domain)
+            or (project and chain.get("projectId") == project)
+        )
+
+    for i in sorted(candidates):
+        chain = all_chains[i]
         score = 0.0
 
         # Domain match bonus
@@ -191,27 +282,10 @@ def recall_chains(context: str, domain: str = None, project: str = None, limit:
         if project and chain.get("projectId") == project:
             score += 0.2
 
-        # Trigger similarity
-        trigger_terms = extract_key_terms(chain.get("trigger", ""))
-        if trigger_terms and context_terms:
-            trigger_overlap = len(context_terms & trigger_terms) / max(len(context_terms | trigger_terms), 1)
-            score += trigger_overlap * 0.25
-
-        # Conclusion similarity
-        conclusion_terms = extract_key_terms(chain.get("conclusion", ""))
-        if conclusion_terms and context_terms:
-            conclusion_overlap = len(context_terms & conclusion_terms) / max(len(context_terms | conclusion_terms), 1)
-            score += conclusion_overlap * 0.15
-
-        # Steps similarity (check observation + interpretation text)
-        steps_text = " ".join(
-            f"{s.get('observation', '')} {s.get('interpretation', '')}"
-            for s in chain.get("steps", [])
-        )
-        steps_terms = extract_key_terms(steps_text)
-        if steps_terms and context_terms:
-            steps_overlap = len(context_terms & steps_terms) / max(len(context_terms | steps_terms), 1)
-            score += steps_overlap * 0.1
+        # Trigger, conclusion and steps (observation + interpretation) similarity
+        score += jaccard(context_terms, trigger_sets[i]) * 0.25
+        score += jaccard(context_terms, conclusion_sets[i]) * 0.15
+        score += jaccard(context_terms, steps_sets[i]) * 0.1
 
         # Successful outcomes preferred
         if chain.get("outcome") == "success":
@@ -226,8 +300,8 @@ def recall_chains(context: str, domain: str = None, project: str = None, limit:
         if score > 0.1:  # Minimum threshold
             scored.append({"chain": chain, "score": score})
 
-    scored.sort(key=lambda x: x["score"], reverse=True)
-    return [s["chain"] for s in scored[:limit]]
+    # Same order as a stable descending sort, without sorting every match
+    return [s["chain"] for s in heapq.nlargest(limit, scored, key=lambda x: x["score"])]
 
 
 def format_for_injection(context: str, project: str = None, limit: int = 3) -> Optional[str]:
@@ -19,6 +19,7 @@ Usage:
     python3 add_improvement.py list [--all]
 """
 
+import fcntl
 import json
 import sys
 import argparse
@@ -26,7 +27,14 @@ from pathlib import Path
 from datetime import datetime
 import hashlib
 
-IMPROVEMENTS_PATH = Path.home() / '.claude-dash' / 'improvements.json'
+MEMORY_ROOT = Path.home() / '.claude-dash'
+
+# Shared JSON/atomic-write helpers live with the learning modules
+sys.path.insert(0, str(MEMORY_ROOT / 'learning'))
+from _jsonio import json_dumps, write_atomic
+
+IMPROVEMENTS_PATH = MEMORY_ROOT / 'improvements.json'
+LOCK_PATH = IMPROVEMENTS_PATH.with_suffix('.lock')
 
 
 def load_improvements():
@@ -57,7 +65,7 @@ def save_improvements(data):
         'pendingIssues': len([i for i in data.get('issues', []) if i.get('status') != 'resolved']),
         'pendingDebt': len([i for i in data.get('techDebt', []) if i.get('status') == 'pending'])
     }
-    IMPROVEMENTS_PATH.write_text(json.dumps(data, indent=2))
+    write_atomic(IMPROVEMENTS_PATH, json_dumps(data, indent=True))
 
 
 def generate_id(title):
@@ -67,113 +75,168 @@ def generate_id(title):
     return f"{slug}-{hash_suffix}"
 
 
-def add_idea(title, description, priority='medium', source='session'):
-    """Add a new improvement idea."""
-    data = load_improvements()
-
-    item = {
-        'id': generate_id(title),
-        'title': title,
-        'description': description,
-        'priority': priority,
-        'status': 'pending',
-        'source': source,
-        'addedAt': datetime.now().isoformat()
-    }
-
-    # Check for duplicates
-    existing_ids = [i['id'] for i in data.get('ideas', [])]
-    if item['id'] in existing_ids:
-        print(f"Similar idea already exists: {item['id']}")
+class ImprovementsBatch:
+    """Load the improvements file once, apply several changes, save once on exit.
+
+    Holds an exclusive lock on improvements.lock for the whole load/save so
+    concurrent invocations (e.g. hooks in sibling repos) don't drop each
+    other's changes.
+
+        with ImprovementsBatch() as batch:
+            batch.add_issue("Gateway not running", "...", "health_check")
+            batch.add_issue("Watcher not running", "...", "health_check")
+    """
+
+    def __init__(self):
+        self.data = None
+        self.dirty = False
+        self._lock = None
+
+    def __enter__(self):
+        LOCK_PATH.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = open(LOCK_PATH, 'a')
+        fcntl.flock(self._lock, fcntl.LOCK_EX)
+        try:
+            self.data = load_improvements()
+        except:
+            self._release()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None and self.dirty:
+                save_improvements(self.data)
+        finally:
+            self._release()
         return False
 
-    data['ideas'].append(item)
-    save_improvements(data)
-    print(f"Added idea: [{priority}] {title}")
-    return True
+    def _release(self):
+        fcntl.flock(self._lock, fcntl.LOCK_UN)
+        self._lock.close()
+        self._lock = None
+
+    def add_idea(self, title, description, priority='medium', source='session'):
+        """Add a new improvement idea."""
+        item = {
+            'id': generate_id(title),
+            'title': title,
+            'description': description,
+            'priority': priority,
+            'status': 'pending',
+            'source': source,
+            'addedAt': datetime.now().isoformat()
+        }
 
+        # Check for duplicates
+        existing_ids = [i['id'] for i in self.data.get('ideas', [])]
+        if item['id'] in existing_ids:
+            print(f"Similar idea already exists: {item['id']}")
+            return False
+
+        self.data['ideas'].append(item)
+        self.dirty = True
+        print(f"Added idea: [{priority}] {title}")
+        return True
+
+    def add_debt(self, title, description, file_path=None, priority='low'):
+        """Add a tech debt item."""
+        item = {
+            'id': generate_id(title),
+            'title': title,
+            'description': description,
+            'priority': priority,
+            'status': 'pending',
+            'addedAt': datetime.now().isoformat()
+        }
+        if file_path:
+            item['file'] = file_path
+
+        # Check for duplicates
+        existing_ids = [i['id'] for i in self.data.get('techDebt', [])]
+        if item['id'] in existing_ids:
+            print(f"Similar debt item already exists: {item['id']}")
+            return False
+
+        self.data['techDebt'].append(item)
+        self.dirty = True
+        print(f"Added tech debt: {title}")
+        return True
+
+    def add_issue(self, title, description, source='unknown'):
+        """Log an issue from health checks or other scripts."""
+        item = {
+            'id': generate_id(title),
+            'title': title,
+            'description': description,
+            'status': 'open',
+            'source': source,
+            'detectedAt': datetime.now().isoformat()
+        }
 
-def add_debt(title, description, file_path=None, priority='low'):
-    """Add a tech debt item."""
-    data = load_improvements()
+        # Check for duplicates
+        existing_ids = [i['id'] for i in self.data.get('issues', [])]
+        if item['id'] in existing_ids:
+            # Update detection time for existing issue
+            for issue in self.data['issues']:
+                if issue['id'] == item['id']:
+                    issue['lastSeen'] = datetime.now().isoformat()
+                    self.dirty = True
+                    return False
+
+        self.data['issues'].append(item)
+        self.dirty = True
+        print(f"Logged issue: {title}")
+        return True
+
+    def mark_complete(self, item_id):
+        """Mark an item as complete/resolved."""
+        found = False
+
+        for collection in ['ideas', 'techDebt', 'issues']:
+            for item in self.data.get(collection, []):
+                if item['id'] == item_id or item['title'].lower() == item_id.lower():
+                    if collection == 'issues':
+                        item['status'] = 'resolved'
+                    else:
+                        item['status'] = 'completed'
+                    item['completedAt'] = datetime.now().isoformat()
+                    found = True
+                    print(f"Marked as complete: {item['title']}")
+                    break
+            if found:
+                break
 
-    item = {
-        'id': generate_id(title),
-        'title': title,
-        'description': description,
-        'priority': priority,
-        'status': 'pending',
-        'addedAt': datetime.now().isoformat()
-    }
-    if file_path:
-        item['file'] = file_path
+        if found:
+            self.dirty = True
+        else:
+            print(f"Item not found: {item_id}")
 
-    # Check for duplicates
-    existing_ids = [i['id'] for i in data.get('techDebt', [])]
-    if item['id'] in existing_ids:
-        print(f"Similar debt item already exists: {item['id']}")
-        return False
+        return found
 
-    data['techDebt'].append(item)
-    save_improvements(data)
-    print(f"Added tech debt: {title}")
-    return True
 
+def add_idea(title, description, priority='medium', source='session'):
+    """Add a new improvement idea."""
+    with ImprovementsBatch() as batch:
+        return batch.add_idea(title, description, priority, source)
 
-def add_issue(title, description, source='unknown'):
-    """Log an issue from health checks or other scripts."""
-    data = load_improvements()
 
-    item = {
-        'id': generate_id(title),
-        'title': title,
-        'description': description,
-        'status': 'open',
-        'source': source,
-        'detectedAt': datetime.now().isoformat()
-    }
+def add_debt(title, description, file_path=None, priority='low'):
+    """Add a tech debt item."""
+    with ImprovementsBatch() as batch:
+        return batch.add_debt(title, description, file_path, priority)
 
-    # Check for duplicates
-    existing_ids = [i['id'] for i in data.get('issues', [])]
-    if item['id'] in existing_ids:
-        # Update detection time for existing issue
-        for issue in data['issues']:
-            if issue['id'] == item['id']:
-                issue['lastSeen'] = datetime.now().isoformat()
-                save_improvements(data)
-                return False
 
-    data['issues'].append(item)
-    save_improvements(data)
-    print(f"Logged issue: {title}")
-    return True
+def add_issue(title, description, source='unknown'):
+    """Log an issue from health checks or other scripts."""
+    with ImprovementsBatch() as batch:
+        return batch.add_issue(title, description, source)
 
 
 def mark_complete(item_id):
     """Mark an item as complete/resolved."""
-    data = load_improvements()
-    found = False
-
-    for collection in ['ideas', 'techDebt', 'issues']:
-        for item in data.get(collection, []):
-            if item['id'] == item_id or item['title'].lower() == item_id.lower():
-                if collection == 'issues':
-                    item['status'] = 'resolved'
-                else:
-                    item['status'] = 'completed'
-                item['completedAt'] = datetime.now().isoformat()
-                found = True
-                print(f"Marked as complete: {item['title']}")
-                break
-        if found:
-            break
-
-    if found:
-        save_improvements(data)
-    else:
-        print(f"Item not found: {item_id}")
-
-    return found
+    with ImprovementsBatch() as batch:
+        return batch.mark_complete(item_id)
 
 
 def list_items(show_all=False):
@@ -20,6 +20,10 @@ from pathlib import Path
 MEMORY_ROOT = Path.home() / ".claude-dash"
 CONFIG_PATH = MEMORY_ROOT / "config.json"
 
+# Shared JSON/atomic-write helpers live with the learning modules
+sys.path.insert(0, str(MEMORY_ROOT / "learning"))
+from _jsonio import json_dumps, write_atomic
+
 
 def load_config():
     """Load claude-dash config."""
@@ -135,8 +139,8 @@ def save_roadmap(project_id: str, roadmap: dict) -> bool:
     roadmap_path = MEMORY_ROOT / "projects" / project_id / "roadmap.json"
     try:
         roadmap["lastUpdated"] = datetime.now().isoformat()
-        with open(roadmap_path, "w") as f:
-            json.dump(roadmap, f, indent=2)
+        # Encode in one go, then a single atomic write
+        write_atomic(roadmap_path, json_dumps(roadmap, indent=True))
         return True
     except IOError:
         return False
@@ -209,9 +213,14 @@ def complete_task(roadmap: dict, match: dict) -> bool:
     return False
 
 
-def sync_commits_to_roadmap(project_id: str, commits: list, dry_run: bool = False) -> list:
-    """Sync commits to roadmap, returning list of updates made."""
-    roadmap = load_roadmap(project_id)
+def sync_commits_to_roadmap(project_id: str, commits: list, dry_run: bool = False,
+                            roadmap: dict | None = None) -> list:
+    """Sync commits to roadmap, returning list of updates made.
+
+    Pass an already-loaded roadmap to skip re-reading it; it is modified in place.
+    """
+    if roadmap is None:
+        roadmap = load_roadmap(project_id)
     if not roadmap:
         return []
 
@@ -274,7 +283,7 @@ def main():
     print(f"Analyzing {len(commits)} commit(s) for project '{project_id}'...")
 
     # Sync
-    updates = sync_commits_to_roadmap(project_id, commits, args.dry_run)
+    updates = sync_commits_to_roadmap(project_id, commits, args.dry_run, roadmap)
 
     if updates:
         print(f"\n{'Would update' if args.dry_run else 'Updated'} {len(updates)} task(s):")
@@ -175,11 +175,15 @@ def get_pending_improvements():
         return []
 
 
-def log_issue_to_backlog(title, description, source='health_check'):
-    """Log an issue to the improvements backlog (if not already there)."""
+def log_issues_to_backlog(issues, source='health_check'):
+    """Log (title, description) issues to the improvements backlog in one load/save."""
+    if not issues:
+        return
     try:
-        from add_improvement import add_issue
-        add_issue(title, description, source)
+        from add_improvement import ImprovementsBatch
+        with ImprovementsBatch() as batch:
+            for title, description in issues:
+                batch.add_issue(title, description, source)
     except:
         pass  # Don't fail if logging fails
 
@@ -197,22 +201,26 @@ def run_health_check():
         'improvements': []
     }
 
+    # Issues to record in the improvements backlog (written once below)
+    backlog = []
+
     # Check services
     if not results['services']['gateway']:
         results['issues'].append("Gateway not running")
-        log_issue_to_backlog("Gateway not running", "MCP gateway service is down", "health_check")
+        backlog.append(("Gateway not running", "MCP gateway service is down"))
     if not results['services']['watcher']:
         results['issues'].append("Watcher not running")
-        log_issue_to_backlog("Watcher not running", "File watcher service is down", "health_check")
+        backlog.append(("Watcher not running", "File watcher service is down"))
     if not results['services']['ollama']:
         results['issues'].append("Ollama not responding")
-        log_issue_to_backlog("Ollama not responding", "Local AI service not responding", "health_check")
+        backlog.append(("Ollama not responding", "Local AI service not responding"))
 
     # Database issues
     db_issues = check_database()
     results['issues'].extend(db_issues)
-    for issue in db_issues:
-        log_issue_to_backlog(issue, issue, "health_check")
+    backlog.extend((issue, issue) for issue in db_issues)
+
+    log_issues_to_backlog(backlog, "health_check")
 
     # Recent errors
     errors = check_recent_errors()